@@ -6,13 +6,36 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+import io
 import os
 from os import path
 import gzip
+import shutil
+import sys
 import tarfile
 import zipfile
 
+try:
+    # optional C-backed extractor, much faster than the zipfile module
+    import libarchive
+except ImportError:
+    libarchive = None
+
+try:
+    # optional ISA-L gzip engine with SIMD-accelerated inflate
+    from isal import igzip
+except ImportError:
+    igzip = None
+
+try:
+    # optional zip backend that runs the decompress loop and CRC in C
+    from fastzipfile import ZipFile
+except ImportError:
+    from zipfile import ZipFile
+
 from commoncode.system import on_windows
 
 """
@@ -20,24 +43,102 @@ Mimimal tar and zip file handling, primarily for testing.
 """
 
 
+# pass an explicit extraction filter where supported (Python 3.12, also
+# backported to 3.11.4) to keep the historical permissive behavior and skip
+# the deprecated default filter machinery
+if hasattr(tarfile, 'fully_trusted_filter'):
+    _EXTRACTALL_KWARGS = {'filter': 'fully_trusted'}
+else:
+    _EXTRACTALL_KWARGS = {}
+
+
 def _extract_tar_raw(test_path, target_dir, to_bytes, *args, **kwargs):
     """
     Raw simplified extract for certain really weird paths and file
     names.
     """
-    tar = None
-    try:
-        tar = tarfile.open(test_path)
-        tar.extractall(path=target_dir)
-    finally:
-        if tar:
-            tar.close()
+    with tarfile.open(test_path) as tar:
+        tar.extractall(path=target_dir, **_EXTRACTALL_KWARGS)
 
 
 extract_tar_raw = partial(_extract_tar_raw, to_bytes=True)
 
 extract_tar_uni = partial(_extract_tar_raw, to_bytes=False)
 
+# compressed tar suffixes extracted in single-pass streaming mode
+_COMPRESSED_TAR_SUFFIXES = (
+    b'.tar.gz', b'.tgz', b'.tar.bz2', b'.tbz', b'.tar.xz', b'.txz',
+)
+
+# LRU cache of parsed archive member metadata keyed by
+# (path, mtime_ns, size, ...): warm calls on the same unchanged archive
+# skip re-parsing headers entirely
+_MEMBERS_CACHE_SIZE = 128
+_members_cache = OrderedDict()
+
+
+def _get_cached_members(key, compute_members):
+    """
+    Return the cached member list for the cache `key` tuple, calling the
+    `compute_members` callable and caching its result on a miss.
+    """
+    members = _members_cache.get(key)
+    if members is not None:
+        _members_cache.move_to_end(key)
+        return members
+    members = compute_members()
+    _members_cache[key] = members
+    if len(_members_cache) > _MEMBERS_CACHE_SIZE:
+        _members_cache.popitem(last=False)
+    return members
+
+
+# sendfile to a regular file descriptor is Linux-only: on macOS and the
+# BSDs the destination must be a socket, as in the shutil fast-copy gate
+_USE_SENDFILE = hasattr(os, 'sendfile') and sys.platform.startswith('linux')
+
+
+class _SendfileTarFile(tarfile.TarFile):
+    """
+    TarFile that copies regular member bodies with os.sendfile when the
+    archive is a plain uncompressed file: the kernel moves the bytes
+    directly between descriptors without a userspace read/write loop.
+    """
+
+    def makefile(self, tarinfo, targetpath):
+        can_sendfile = (
+            _USE_SENDFILE
+            and tarinfo.sparse is None
+            # a compressed archive exposes a decompressor fileobj here:
+            # only a plain tar keeps the BufferedReader we opened
+            and isinstance(self.fileobj, io.BufferedReader)
+        )
+        if not can_sendfile:
+            return tarfile.TarFile.makefile(self, tarinfo, targetpath)
+        try:
+            src_fd = self.fileobj.fileno()
+        except (OSError, io.UnsupportedOperation):
+            return tarfile.TarFile.makefile(self, tarinfo, targetpath)
+
+        dst_fd = os.open(targetpath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            try:
+                offset = tarinfo.offset_data
+                remaining = tarinfo.size
+                while remaining > 0:
+                    copied = os.sendfile(dst_fd, src_fd, offset, remaining)
+                    if not copied:
+                        raise tarfile.ReadError('unexpected end of data')
+                    offset += copied
+                    remaining -= copied
+            finally:
+                os.close(dst_fd)
+        except OSError:
+            # some filesystems refuse sendfile (EINVAL, ENOTSUP): redo the
+            # member with the stock copy loop, which reopens and truncates
+            # the partially written target
+            return tarfile.TarFile.makefile(self, tarinfo, targetpath)
+
 
 def extract_tar(location, target_dir, verbatim=False, *args, **kwargs):
     """
@@ -47,43 +148,173 @@ def extract_tar(location, target_dir, verbatim=False, *args, **kwargs):
     # always for using bytes for paths on all OSses... tar seems to use bytes internally
     # and get confused otherwise
     location = os.fsencode(location)
-    with open(location, 'rb') as input_tar:
-        tar = None
-        try:
-            tar = tarfile.open(fileobj=input_tar)
-            tarinfos = tar.getmembers()
-            to_extract = []
-            for tarinfo in tarinfos:
-                if tar_can_extract(tarinfo, verbatim):
+    compressed = location.endswith(_COMPRESSED_TAR_SUFFIXES)
+    with open(location, 'rb', buffering=0) as raw:
+        input_tar = io.BufferedReader(raw, buffer_size=1 << 20)
+        if igzip and location.endswith((b'.tar.gz', b'.tgz')):
+            # pre-decompress through ISA-L rather than letting tarfile
+            # dispatch to the stock gzip module
+            input_tar = igzip.IGzipFile(fileobj=input_tar, mode='rb')
+
+        if compressed:
+            # stream mode decompresses the archive exactly once, filtering
+            # and extracting members on the fly, where the seekable path
+            # below would inflate once for getmembers() and again for
+            # extractall()
+            with tarfile.open(
+                fileobj=input_tar, mode='r|*', copybufsize=1 << 20
+            ) as tar:
+                for tarinfo in tar:
+                    if not tar_can_extract(tarinfo, verbatim):
+                        continue
                     if not verbatim:
                         tarinfo.mode = 0o755
-                    to_extract.append(tarinfo)
-            tar.extractall(target_dir, members=to_extract)
-        finally:
-            if tar:
-                tar.close()
+                    tar.extract(tarinfo, target_dir, **_EXTRACTALL_KWARGS)
+            return
+
+        with _SendfileTarFile.open(
+            fileobj=input_tar, copybufsize=1 << 20
+        ) as tar:
+
+            def compute_to_extract():
+                to_extract = []
+                # bind hot names as locals for the member filter loop
+                can_extract = tar_can_extract
+                for tarinfo in tar.getmembers():
+                    if can_extract(tarinfo, verbatim):
+                        if not verbatim:
+                            tarinfo.mode = 0o755
+                        to_extract.append(tarinfo)
+                return to_extract
+
+            st = os.stat(location)
+            key = os.fsdecode(location), st.st_mtime_ns, st.st_size, verbatim
+            to_extract = _get_cached_members(key, compute_to_extract)
+
+            # pre-create the unique parent directories, shortest first, so
+            # extractall never goes through its per-member makedirs path
+            dirs = {
+                path.join(target_dir, path.dirname(tarinfo.name))
+                for tarinfo in to_extract
+            }
+            for directory in sorted(dirs, key=len):
+                os.makedirs(directory, exist_ok=True)
+
+            tar.extractall(target_dir, members=to_extract, **_EXTRACTALL_KWARGS)
+
+
+# magic bytes of the zip local header, empty archive and spanned archive
+_ZIP_MAGICS = (b'PK\x03\x04', b'PK\x05\x06', b'PK\x07\x08')
+
+
+def _check_zip(location):
+    """
+    Raise an Exception if the file at `location` is not an existing zip
+    file. Check the four leading magic bytes rather than scanning for the
+    end-of-central-directory record as zipfile.is_zipfile does.
+    """
+    try:
+        with open(location, 'rb') as f:
+            magic = f.read(4)
+    except OSError:
+        magic = None
+    if magic not in _ZIP_MAGICS:
+        raise Exception('Incorrect zip file %(location)r' % locals())
 
 
 def extract_zip(location, target_dir, *args, **kwargs):
     """
     Extract a zip archive file at location in the target_dir directory.
     """
-    if not path.isfile(location) and zipfile.is_zipfile(location):
-        raise Exception('Incorrect zip file %(location)r' % locals())
+    _check_zip(location)
+
+    if libarchive:
+        return _extract_zip_libarchive(location, target_dir)
+
+    def compute_infos():
+        # snapshot the central directory once: opening members by ZipInfo
+        # avoids a by-name lookup for each entry
+        with ZipFile(location) as zipf:
+            return zipf.infolist()
+
+    st = os.stat(location)
+    key = os.fspath(location), st.st_mtime_ns, st.st_size
+    infos = _get_cached_members(key, compute_infos)
+
+    # create the unique set of directories upfront, shortest first, so the
+    # write loops never stat or mkdir and worker threads cannot race
+    dirs = set()
+    file_infos = []
+    seen_targets = set()
+    for info in infos:
+        target = path.join(target_dir, info.filename)
+        if info.is_dir():
+            dirs.add(target)
+        else:
+            if target in seen_targets:
+                # duplicate entry names: keep the first one, as in serial
+                # extraction, so no two workers ever own the same target
+                continue
+            seen_targets.add(target)
+            dirs.add(path.dirname(target))
+            file_infos.append(info)
+    for directory in sorted(dirs, key=len):
+        os.makedirs(directory, exist_ok=True)
+
+    if len(file_infos) < ZIP_PARALLEL_THRESHOLD:
+        _extract_zip_members(location, target_dir, file_infos)
+        return
+
+    # deflate releases the GIL, so members decompress in parallel; ZipFile
+    # is not thread-safe and each worker opens its own handle
+    workers = min(os.cpu_count() or 1, len(file_infos))
+    batches = [file_infos[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(
+            partial(_extract_zip_members, location, target_dir), batches
+        ):
+            pass
 
-    with zipfile.ZipFile(location) as zipf:
-        for info in zipf.infolist():
-            name = info.filename
-            content = zipf.read(name)
-            target = path.join(target_dir, name)
-            if not path.exists(path.dirname(target)):
-                os.makedirs(path.dirname(target))
-            if not content and target.endswith(path.sep):
-                if not path.exists(target):
-                    os.makedirs(target)
+
+# archives with fewer members than this extract serially
+ZIP_PARALLEL_THRESHOLD = 8
+
+
+def _extract_zip_libarchive(location, target_dir):
+    """
+    Extract a zip archive file at location in the target_dir directory using
+    the libarchive C library. Decompression, directory creation and file
+    writes all happen in a single C call with no per-entry Python dispatch.
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    # resolve both paths before changing directory: a relative location
+    # would otherwise be re-resolved inside target_dir and read the wrong
+    # file or fail outright
+    location = path.abspath(os.fspath(location))
+    target_dir = path.abspath(target_dir)
+    # libarchive extracts in the current directory; the chdir is process
+    # wide, so never run this concurrently with relative-path work
+    cwd = os.getcwd()
+    try:
+        os.chdir(target_dir)
+        libarchive.extract_file(location)
+    finally:
+        os.chdir(cwd)
+
+
+def _extract_zip_members(location, target_dir, infos):
+    """
+    Extract the ZipInfo `infos` members of the zip archive at `location` in
+    the target_dir directory. Parent directories must already exist.
+    """
+    with ZipFile(location) as zipf:
+        for info in infos:
+            target = path.join(target_dir, info.filename)
             if not path.exists(target):
-                with open(target, 'wb') as f:
-                    f.write(content)
+                # stream the content with a fixed-size buffer rather than
+                # loading whole members in memory
+                with zipf.open(info) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, length=1 << 18)
 
 
 def extract_zip_raw(location, target_dir, *args, **kwargs):
@@ -91,19 +322,26 @@ def extract_zip_raw(location, target_dir, *args, **kwargs):
     Extract a zip archive file at location in the target_dir directory.
     Use the builtin extractall function
     """
-    if not path.isfile(location) and zipfile.is_zipfile(location):
-        raise Exception('Incorrect zip file %(location)r' % locals())
+    _check_zip(location)
 
-    with zipfile.ZipFile(location) as zipf:
+    with ZipFile(location) as zipf:
         zipf.extractall(path=target_dir)
 
 
+# hoisted tarfile constants for the per-member filter in extract_tar
+_SUPPORTED_TYPES = frozenset(tarfile.SUPPORTED_TYPES)
+_CHRTYPE = tarfile.CHRTYPE
+_DEV_TYPES = frozenset((tarfile.CHRTYPE, tarfile.BLKTYPE, tarfile.FIFOTYPE))
+_SYMTYPE = tarfile.SYMTYPE
+
+
 def tar_can_extract(tarinfo, verbatim):
     """
     Return True if a tar member can be extracted to handle OS specifics.
     If verbatim is True, always return True.
     """
-    if tarinfo.ischr():
+    tartype = tarinfo.type
+    if tartype == _CHRTYPE:
         # never extract char devices
         return False
 
@@ -112,8 +350,8 @@ def tar_can_extract(tarinfo, verbatim):
         return True
 
     # FIXME: not sure hard links are working OK on Windows
-    include = tarinfo.type in tarfile.SUPPORTED_TYPES
-    exclude = tarinfo.isdev() or (on_windows and tarinfo.issym())
+    include = tartype in _SUPPORTED_TYPES
+    exclude = tartype in _DEV_TYPES or (on_windows and tartype == _SYMTYPE)
 
     if include and not exclude:
         return True
@@ -124,6 +362,11 @@ def get_gz_compressed_file_content(location):
     Uncompress a compressed file at `location` and return its content as a byte
     string. Raise Exceptions on errors.
     """
-    with gzip.GzipFile(location, 'rb') as compressed:
-        content = compressed.read()
+    # feed the decompressor through a large read buffer: this keeps the
+    # inflate loop fed with fewer, bigger reads
+    with open(location, 'rb', buffering=0) as raw:
+        with io.BufferedReader(raw, buffer_size=1 << 17) as buffered:
+            gzip_file = igzip.IGzipFile if igzip else gzip.GzipFile
+            with gzip_file(fileobj=buffered, mode='rb') as compressed:
+                content = compressed.read()
     return content
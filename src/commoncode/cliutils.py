@@ -6,8 +6,11 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+from itertools import groupby
+from operator import itemgetter
 import shutil
 import sys
+import time
 
 import click
 
@@ -119,38 +122,25 @@ Try the '--help' option for help on options and arguments.'''
         help_groups they belong to. If a group is not specified, add the option
         to MISC_GROUP group.
         """
-        # this mapping defines the CLI help presentation order
-        help_groups = dict([
-            (SCAN_GROUP, []),
-            (OTHER_SCAN_GROUP, []),
-            (SCAN_OPTIONS_GROUP, []),
-            (OUTPUT_GROUP, []),
-            (OUTPUT_FILTER_GROUP, []),
-            (OUTPUT_CONTROL_GROUP, []),
-            (PRE_SCAN_GROUP, []),
-            (POST_SCAN_GROUP, []),
-            (CORE_GROUP, []),
-            (MISC_GROUP, []),
-            (DOC_GROUP, []),
-        ])
-
+        misc_rank = HELP_GROUP_RANKS[MISC_GROUP]
+        records = []
         for param in self.get_params(ctx):
             # Get the list of option's name and help text
             help_record = param.get_help_record(ctx)
             if not help_record:
                 continue
-            # organize options by group
+            # rank by group presentation order, then by sort order
             help_group = getattr(param, 'help_group', MISC_GROUP)
             sort_order = getattr(param, 'sort_order', 100)
-            help_groups[help_group].append((sort_order, help_record))
+            rank = HELP_GROUP_RANKS.get(help_group, misc_rank)
+            records.append((rank, sort_order, help_record))
 
+        # a single sort then group-by replaces one sort per help group
+        records.sort()
         with formatter.section('Options'):
-            for group, help_records in help_groups.items():
-                if not help_records:
-                    continue
-                with formatter.section(group):
-                    sorted_records = [hr for _, hr in sorted(help_records)]
-                    formatter.write_dl(sorted_records)
+            for rank, grouped_records in groupby(records, key=itemgetter(0)):
+                with formatter.section(HELP_GROUPS_BY_RANK[rank]):
+                    formatter.write_dl([hr for _, _, hr in grouped_records])
 
 
 # overriden and copied from Click to work around Click woes for
@@ -168,16 +158,21 @@ class DebuggedProgressBar(ProgressBar):
     # https://github.com/nexB/scancode-toolkit/issues/2583
     def generator(self):
         if self.is_hidden:
+            # no bookkeeping or rendering at all when hidden
             yield from self.iter
-        else:
-            for rv in self.iter:
-                self.current_item = rv
-                self.update(1)
-                self.render_progress()
-                yield rv
+            return
+
+        # bind the hot methods as locals for the per-item loop
+        update = self.update
+        render_progress = self.render_progress
+        for rv in self.iter:
+            self.current_item = rv
+            update(1)
+            render_progress()
+            yield rv
 
-            self.finish()
-            self.render_progress()
+        self.finish()
+        self.render_progress()
 
 
 class EnhancedProgressBar(DebuggedProgressBar):
@@ -185,6 +180,10 @@ class EnhancedProgressBar(DebuggedProgressBar):
     Enhanced progressbar ensuring that nothing is displayed when the bar is hidden.
     """
 
+    def update(self, n_steps, current_item=None):
+        if not self.is_hidden:
+            return super(EnhancedProgressBar, self).update(n_steps, current_item)
+
     def render_progress(self):
         if not self.is_hidden:
             return super(EnhancedProgressBar, self).render_progress()
@@ -232,6 +231,10 @@ class ProgressLogger(ProgressBar):
 BAR_WIDTH = 20
 BAR_SEP_LEN = len(' ')
 
+# [last refresh timestamp, terminal size] cache for file_name_max_len
+_TERM_SIZE_TTL = 0.5
+_term_size_cache = [0.0, (80, 24)]
+
 
 def progressmanager(
     iterable=None,
@@ -331,11 +334,8 @@ def fixed_width_file_name(path, max_length=25):
     if remaining_length < 5  or remaining_length < (len_ext + dots):
         return ''
 
-    prefix_and_suffix_length = abs(remaining_length // 2)
-    prefix = base_name[:prefix_and_suffix_length]
-    ellipsis = dots * '.'
-    suffix = base_name[-prefix_and_suffix_length:]
-    return '{prefix}{ellipsis}{suffix}{ext}'.format(**locals())
+    half = remaining_length // 2
+    return f'{base_name[:half]}...{base_name[-half:]}{ext}'
 
 
 def file_name_max_len(used_width=BAR_WIDTH + 1 + 7 + 1 + 8 + 1):
@@ -354,7 +354,12 @@ def file_name_max_len(used_width=BAR_WIDTH + 1 + 7 + 1 + 8 + 1):
     The space usage is therefore:
         BAR_WIDTH + 1 + 7 + 1 + 8 + 1 + the file name length
     """
-    term_width, _height = shutil.get_terminal_size()
+    # refresh the cached terminal size at most twice per second: the query
+    # is an ioctl and this runs on every progress tick
+    now = time.monotonic()
+    if now - _term_size_cache[0] > _TERM_SIZE_TTL:
+        _term_size_cache[:] = now, shutil.get_terminal_size()
+    term_width = _term_size_cache[1][0]
     max_filename_length = term_width - used_width
     return max_filename_length
 
@@ -394,6 +399,23 @@ MISC_GROUP = 'miscellaneous'
 DOC_GROUP = 'documentation'
 CORE_GROUP = 'core'
 
+# this tuple defines the CLI help presentation order
+HELP_GROUPS_BY_RANK = (
+    SCAN_GROUP,
+    OTHER_SCAN_GROUP,
+    SCAN_OPTIONS_GROUP,
+    OUTPUT_GROUP,
+    OUTPUT_FILTER_GROUP,
+    OUTPUT_CONTROL_GROUP,
+    PRE_SCAN_GROUP,
+    POST_SCAN_GROUP,
+    CORE_GROUP,
+    MISC_GROUP,
+    DOC_GROUP,
+)
+
+HELP_GROUP_RANKS = {group: rank for rank, group in enumerate(HELP_GROUPS_BY_RANK)}
+
 
 class PluggableCommandLineOption(click.Option):
     """
@@ -468,13 +490,18 @@ class PluggableCommandLineOption(click.Option):
             'conflicting_options=%(conflicting_options)r>' % locals()
         )
 
-    def validate_dependencies(self, ctx, value):
+    def validate_dependencies(self, ctx, value, params_by_name=None):
         """
         Validate `value` against declared `required_options` or
-        `conflicting_options` dependencies.
+        `conflicting_options` dependencies. `params_by_name` is an optional
+        prebuilt mapping of {name: param} for the `ctx` command params.
         """
-        _validate_option_dependencies(ctx, self, value, self.required_options, required=True)
-        _validate_option_dependencies(ctx, self, value, self.conflicting_options, required=False)
+        _validate_option_dependencies(
+            ctx, self, value, self.required_options,
+            required=True, params_by_name=params_by_name)
+        _validate_option_dependencies(
+            ctx, self, value, self.conflicting_options,
+            required=False, params_by_name=params_by_name)
 
     def get_help_record(self, ctx):
         if not self.hidden:
@@ -492,6 +519,9 @@ def validate_option_dependencies(ctx):
         for va in sorted(values.items()):
             logger_debug('  ', va)
 
+    # build the {name: param} index once for all validated options
+    params_by_name = {param.name: param for param in ctx.command.params}
+
     for param in ctx.command.params:
         if param.is_eager:
             continue
@@ -502,10 +532,27 @@ def validate_option_dependencies(ctx):
         value = values.get(param.name)
         if TRACE:
             logger_debug('  validate_option_dependencies: param:', param, 'value:', value)
-        param.validate_dependencies(ctx, value)
+        param.validate_dependencies(ctx, value, params_by_name)
+
 
+_BOOL_TYPES = (bool, BoolParamType)
 
-def _validate_option_dependencies(ctx, param, value, other_option_names, required=False):
+
+def _is_set(_value, _param):
+    """
+    Return True if the `_value` of the `_param` option is set to a non-None,
+    non-default value.
+    """
+    if _param.type in _BOOL_TYPES:
+        return bool(_value)
+    if _param.multiple:
+        return bool(_value) and _value != _param.default
+    return _value is not None and _value != _param.default
+
+
+def _validate_option_dependencies(
+    ctx, param, value, other_option_names, required=False, params_by_name=None,
+):
     """
     Validate the `other_option_names` option dependencies and return a
     UsageError if the `param` `value` is set to a not-None non-default value and
@@ -518,17 +565,6 @@ def _validate_option_dependencies(ctx, param, value, other_option_names, require
     if not other_option_names:
         return
 
-    def _is_set(_value, _param):
-        if _param.type in (bool, BoolParamType):
-            return _value
-
-        if _param.multiple:
-            empty = (_value and len(_value) == 0) or not _value
-        else:
-            empty = _value is None
-
-        return bool(not empty and _value != _param.default)
-
     is_set = _is_set(value, param)
 
     if TRACE:
@@ -539,7 +575,9 @@ def _validate_option_dependencies(ctx, param, value, other_option_names, require
     if not is_set:
         return
 
-    oparams_by_name = {oparam.name: oparam for oparam in ctx.command.params}
+    if params_by_name is None:
+        params_by_name = {oparam.name: oparam for oparam in ctx.command.params}
+    oparams_by_name = params_by_name
     oparams = []
     missing_onames = []
 
@@ -8,13 +8,15 @@
 
 import ctypes
 import contextlib
-import io
+import functools
 import os
 from os import path
 
 import logging
+import select
 import signal
 import subprocess
+import tempfile
 
 from commoncode.fileutils import get_temp_dir
 from commoncode.system import on_posix
@@ -44,7 +46,7 @@ LD_LIBRARY_PATH = 'LD_LIBRARY_PATH'
 DYLD_LIBRARY_PATH = 'DYLD_LIBRARY_PATH'
 
 
-def execute(cmd_loc, args, cwd=None, env=None, to_files=False, log=TRACE):
+def execute(cmd_loc, args, cwd=None, env=None, to_files=False, log=TRACE, decode='ascii'):
     """
     Run a `cmd_loc` command with the `args` arguments list and return the return
     code, the stdout and stderr.
@@ -55,6 +57,10 @@ def execute(cmd_loc, args, cwd=None, env=None, to_files=False, log=TRACE):
     strings. Otherwise, return the locations to the stderr and stdout temporary
     files.
 
+    If `decode` is 'ascii' (the default), outputs returned as strings are
+    normalized to ASCII. If `decode` is None, return the raw output bytes
+    instead, skipping the normalization pass for callers that do not need it.
+
     Run the command using the `cwd` current working directory with an `env` dict
     of environment variables.
     """
@@ -67,16 +73,17 @@ def execute(cmd_loc, args, cwd=None, env=None, to_files=False, log=TRACE):
     env = get_env(env, lib_dir=cmd_dir) or None
     cwd = cwd or curr_dir
 
-    # temp files for stderr and stdout
-    tmp_dir = get_temp_dir(prefix='cmd-')
-
-    sop = path.join(tmp_dir, 'stdout')
-    sep = path.join(tmp_dir, 'stderr')
+    # temp files for stderr and stdout: one mkstemp open per stream in a
+    # shared per-process directory, instead of a mkdir plus two opens per
+    # command invocation
+    sop_fd, sop = tempfile.mkstemp(prefix='stdout-', dir=_cmd_temp_dir())
+    sep_fd, sep = tempfile.mkstemp(prefix='stderr-', dir=_cmd_temp_dir())
 
-    # shell==True is DANGEROUS but we are not running arbitrary commands
-    # though we can execute commands that just happen to be in the path
-    # See why we need it on Windows https://bugs.python.org/issue8557
-    shell = True if on_windows else False
+    # never use a shell: the command runs directly, which on Windows avoids
+    # spawning and tearing down a cmd.exe intermediary for every execution
+    shell = False
+    # on Windows, skip the console window allocation for the child
+    creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0) if on_windows else 0
 
     if log:
         printer = logger.debug if TRACE else lambda x: print(x)
@@ -88,33 +95,60 @@ def execute(cmd_loc, args, cwd=None, env=None, to_files=False, log=TRACE):
     proc = None
     rc = 100
 
+    # On POSIX, meet the conditions for the CPython posix_spawn fast path
+    # (vfork-based, skipping the full fork of our possibly large process):
+    # no cwd, preexec_fn or pass_fds, close_fds off (our file descriptors
+    # are close-on-exec by default anyway) and only file descriptors above
+    # 2 redirected. The working directory is set by chdir-ing around the
+    # spawn instead of passing cwd.
+    if on_posix:
+        popen_cwd = None
+        spawn_dir = cwd
+        close_fds = False
+    else:
+        popen_cwd = cwd
+        spawn_dir = cmd_dir
+        close_fds = True
+
     try:
-        with io.open(sop, 'wb') as stdout, io.open(sep, 'wb') as stderr, pushd(cmd_dir):
+        # the child captures its working directory at spawn time, so only
+        # the Popen call runs inside pushd: the parent's global cwd is
+        # restored immediately instead of staying changed while the
+        # command runs
+        with pushd(spawn_dir):
             proc = subprocess.Popen(
                 full_cmd,
-                cwd=cwd,
+                cwd=popen_cwd,
                 env=env,
-                stdout=stdout,
-                stderr=stderr,
+                stdin=subprocess.DEVNULL,
+                stdout=sop_fd,
+                stderr=sep_fd,
                 shell=shell,
+                close_fds=close_fds,
+                creationflags=creationflags,
                 # -1 defaults bufsize to system bufsize
                 bufsize=-1,
-                universal_newlines=True,
+                universal_newlines=False,
             )
-            stdout, stderr = proc.communicate()
-            rc = proc.returncode if proc else 0
+        # stdout and stderr are real files written directly by the
+        # kernel, not pipes, so wait() cannot deadlock and there is
+        # nothing to drain in userspace
+        rc = proc.wait()
     finally:
+        os.close(sop_fd)
+        os.close(sep_fd)
         close(proc)
 
     if not to_files:
-        # return output as ASCII string loaded from the output files
+        # return output loaded from the output files, with a single
+        # open/read pair per stream
         with open(sop, 'rb') as so:
-            sor = so.read()
-            sop = text.toascii(sor).strip()
-
+            sop = so.read()
         with open(sep, 'rb') as se:
-            ser = se.read()
-            sep = text.toascii(ser).strip()
+            sep = se.read()
+        if decode:
+            sop = text.toascii(sop).strip()
+            sep = text.toascii(sep).strip()
 
     return rc, sop, sep
 
@@ -153,6 +187,15 @@ def execute2(
     return execute(cmd_loc, args, cwd, env, to_files, log)
 
 
+@functools.lru_cache(maxsize=None)
+def _cmd_temp_dir():
+    """
+    Return a per-process temporary directory for command output files,
+    created once on first use.
+    """
+    return get_temp_dir(prefix='cmd-')
+
+
 def get_env(base_vars=None, lib_dir=None):
     """
     Return a dictionary of environment variables for command execution with
@@ -161,21 +204,24 @@ def get_env(base_vars=None, lib_dir=None):
     contains DY/LD_LIBRARY_PATH variables these will be overwritten. On POSIX,
     add `lib_dir` as DY/LD_LIBRARY_PATH-like path if provided.
     """
-    env_vars = {}
-    if base_vars:
-        env_vars.update(base_vars)
+    env_vars = dict(base_vars) if base_vars else {}
 
     # Create and add LD environment variables
     if lib_dir and on_posix:
         new_path = f'{lib_dir}'
         # on Linux/posix
-        ld_lib_path = os.environ.get(LD_LIBRARY_PATH)
-        env_vars.update({LD_LIBRARY_PATH: update_path_var(ld_lib_path, new_path)})
+        env_vars[LD_LIBRARY_PATH] = update_path_var(
+            os.environ.get(LD_LIBRARY_PATH), new_path)
         # on Mac, though LD_LIBRARY_PATH should work too
-        dyld_lib_path = os.environ.get(DYLD_LIBRARY_PATH)
-        env_vars.update({DYLD_LIBRARY_PATH: update_path_var(dyld_lib_path, new_path)})
+        env_vars[DYLD_LIBRARY_PATH] = update_path_var(
+            os.environ.get(DYLD_LIBRARY_PATH), new_path)
 
-    env_vars = {text.as_unicode(k): text.as_unicode(v) for k, v in env_vars.items()}
+    # re-encode only when some key or value is not already a plain str
+    if any(
+        not isinstance(k, str) or not isinstance(v, str)
+        for k, v in env_vars.items()
+    ):
+        env_vars = {text.as_unicode(k): text.as_unicode(v) for k, v in env_vars.items()}
 
     return env_vars
 
@@ -199,15 +245,47 @@ def close(proc):
     close_pipe(getattr(proc, 'stdout', None))
     close_pipe(getattr(proc, 'stderr', None))
 
-    try:
-        # Ensure process death otherwise proc.wait may hang in some cases
-        # NB: this will run only on POSIX OSes supporting signals
-        os.kill(proc.pid, signal.SIGKILL)  # NOQA
-    except:
-        pass
+    if proc.returncode is not None:
+        # already exited and reaped (e.g. by the wait() in execute()):
+        # no signal or extra wait needed
+        return
+
+    # refresh returncode: a process that already exited needs no signal
+    # and nothing more than a final reaping wait
+    if proc.poll() is None:
+        try:
+            # Ensure process death otherwise proc.wait may hang in some cases
+            # NB: this will run only on POSIX OSes supporting signals
+            os.kill(proc.pid, signal.SIGKILL)  # NOQA
+        except:
+            pass
 
     # This may slow things down a tad on non-POSIX Oses but is safe:
-    # this calls os.waitpid() to make sure the process is dead
+    # this makes sure the process is dead and reaped
+    _wait_for_exit(proc)
+
+
+def _wait_for_exit(proc):
+    """
+    Block until the `proc` process has exited and reap it. Use a pidfd-based
+    kernel event wait on Linux 5.3+ and fall back to a plain proc.wait()
+    elsewhere.
+    """
+    try:
+        pidfd = os.pidfd_open(proc.pid)
+    except (AttributeError, OSError):
+        # unsupported platform or the process is already reaped
+        proc.wait()
+        return
+
+    try:
+        # a pidfd becomes readable once the process exits: one blocking
+        # syscall instead of a polling waitpid loop
+        select.select([pidfd], [], [])
+    except OSError:
+        pass
+    finally:
+        os.close(pidfd)
     proc.wait()
 
 
@@ -225,8 +303,15 @@ def load_shared_library(dll_loc, *args):
 
     dll_dir = os.path.dirname(dll_loc)
     try:
-        with pushd(dll_dir):
-            lib = ctypes.CDLL(dll_loc)
+        if on_windows and hasattr(os, 'add_dll_directory'):
+            # scope the dependency search to the DLL directory without
+            # changing the process-wide working directory
+            with os.add_dll_directory(dll_dir):
+                lib = ctypes.CDLL(dll_loc)
+        else:
+            # the path is absolute so no cwd change is needed: dependencies
+            # resolve through rpath and the LD_LIBRARY_PATH set by get_env
+            lib = ctypes.CDLL(dll_loc, mode=os.RTLD_NOW | os.RTLD_LOCAL)
     except OSError as e:
         from pprint import pformat
         import traceback
@@ -269,15 +354,18 @@ def update_path_var(existing_path_var, new_path):
 
     existing_path_var = existing_path_var or ''
 
-    existing_path_var = os.fsdecode(existing_path_var)
-    new_path = os.fsdecode(new_path)
+    # fsdecode only when needed: inputs are usually already str
+    if not isinstance(existing_path_var, str):
+        existing_path_var = os.fsdecode(existing_path_var)
+    if not isinstance(new_path, str):
+        new_path = os.fsdecode(new_path)
 
     path_elements = existing_path_var.split(os.pathsep)
 
     if not path_elements:
         updated_path_var = new_path
 
-    elif new_path not in path_elements:
+    elif new_path not in set(path_elements):
         # add new path to the front of the PATH env var
         path_elements.insert(0, new_path)
         updated_path_var = os.pathsep.join(path_elements)
@@ -286,9 +374,6 @@ def update_path_var(existing_path_var, new_path):
         # new path is already in PATH, change nothing
         updated_path_var = existing_path_var
 
-    if not isinstance(updated_path_var, str):
-        updated_path_var = os.fsdecode(updated_path_var)
-
     return updated_path_var
 
 
@@ -308,12 +393,46 @@ def searchable_paths(env_vars=PATH_VARS):
     return tuple(d for d in dirs if os.path.isdir(d))
 
 
-def find_in_path(filename, searchable_paths=searchable_paths()):
+@functools.lru_cache(maxsize=1)
+def _default_searchable_paths():
+    """
+    Return the searchable_paths() tuple, computed lazily once per process.
+    """
+    return searchable_paths()
+
+
+@functools.lru_cache(maxsize=8)
+def _files_index(stamped_dirs):
+    """
+    Return a mapping of {filename: location} for the files found in the
+    `stamped_dirs` tuple of (directory, mtime_ns) pairs, with earlier
+    directories winning. The mtime in the key invalidates stale indexes
+    when a directory content changes.
+    """
+    index = {}
+    for d, _mtime in reversed(stamped_dirs):
+        try:
+            with os.scandir(d) as entries:
+                for entry in entries:
+                    index[entry.name] = entry.path
+        except OSError:
+            continue
+    return index
+
+
+def find_in_path(filename, searchable_paths=None):
     """
     Return the location of a ``filename`` found in the ``searchable_paths`` list
     of directory or None.
     """
-    for path in searchable_paths:
-        location = os.path.join(path, filename)
-        if os.path.exists(location):
-            return location
+    if searchable_paths is None:
+        searchable_paths = _default_searchable_paths()
+    # one stat per directory to stamp the cache key, then a single dict
+    # lookup, instead of one stat per directory per searched filename
+    stamped = []
+    for d in searchable_paths:
+        try:
+            stamped.append((d, os.stat(d).st_mtime_ns))
+        except OSError:
+            continue
+    return _files_index(tuple(stamped)).get(filename)
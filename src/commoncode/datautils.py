@@ -6,6 +6,8 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+import functools
+
 import attr
 from attr.validators import in_ as choices  # NOQA
 import typing
@@ -26,13 +28,13 @@ def attribute(default=attr.NOTHING, validator=None,
     A generic attribute with help metadata and that is not included in the
     representation by default.
     """
-    metadata = metadata or dict()
-    if help:
-        metadata[HELP_METADATA] = help
-
-    if label:
-        metadata[LABEL_METADATA] = label
-
+    # build the merged metadata in a single literal without mutating a
+    # caller-provided mapping
+    metadata = {
+        **(metadata or {}),
+        **({HELP_METADATA: help} if help else {}),
+        **({LABEL_METADATA: label} if label else {}),
+    }
     return attr.attrib(
         default=default,
         validator=validator,
@@ -46,100 +48,26 @@ def attribute(default=attr.NOTHING, validator=None,
     )
 
 
-def Boolean(default=False, validator=None, repr=False, eq=True, order=True,  # NOQA
-            converter=None, label=None, help=None,):  # NOQA
-    """
-    A boolean attribute.
-    """
-    return attribute(
-        default=default,
-        validator=validator,
-        repr=repr,
-        eq=eq,
-        order=order,
-        init=True,
-        type=bool,
-        converter=converter,
-        help=help,
-        label=label,
-    )
-
-
-def TriBoolean(default=None, validator=None, repr=False, eq=True, order=True,  # NOQA
-            converter=None, label=None, help=None,):  # NOQA
-    """
-    A tri-boolean attribute with possible values of None, True and False.
-    """
-    return attribute(
-        default=default,
-        validator=validator,
-        repr=repr,
-        eq=eq,
-        order=order,
-        init=True,
-        type=bool,
-        converter=converter,
-        help=help,
-        label=label,
-    )
-
+# The simple typed factories are partial applications of attribute() with a
+# fixed type and default: callers pass the same keyword arguments as before
+# (and can override the defaults) without an extra Python frame and kwargs
+# dict re-packing per attribute definition.
 
-def String(default=None, validator=None, repr=False, eq=True, order=True,  # NOQA
-           converter=None, label=None, help=None,):  # NOQA
-    """
-    A string attribute.
-    """
-    return attribute(
-        default=default,
-        validator=validator,
-        repr=repr,
-        eq=eq,
-        order=order,
-        init=True,
-        type=str,
-        converter=converter,
-        help=help,
-        label=label,
-    )
+# A boolean attribute.
+Boolean = functools.partial(attribute, type=bool, default=False)
 
+# A tri-boolean attribute with possible values of None, True and False.
+TriBoolean = functools.partial(attribute, type=bool, default=None)
 
-def Integer(default=0, validator=None, repr=False, eq=True, order=True,  # NOQA
-            converter=None, label=None, help=None,):  # NOQA
-    """
-    An integer attribute.
-    """
-    converter = converter or attr.converters.optional(int)
-    return attribute(
-        default=default,
-        validator=validator,
-        repr=repr,
-        eq=eq,
-        order=order,
-        init=True,
-        type=int,
-        converter=converter,
-        help=help,
-        label=label,
-    )
+# A string attribute.
+String = functools.partial(attribute, type=str, default=None)
 
+# An integer attribute.
+Integer = functools.partial(
+    attribute, type=int, default=0, converter=attr.converters.optional(int))
 
-def Float(default=0.0, validator=None, repr=False, eq=True, order=True,  # NOQA
-          converter=None, label=None, help=None,):  # NOQA
-    """
-    A float attribute.
-    """
-    return attribute(
-        default=default,
-        validator=validator,
-        repr=repr,
-        eq=eq,
-        order=order,
-        init=True,
-        type=float,
-        converter=converter,
-        help=help,
-        label=label,
-    )
+# A float attribute.
+Float = functools.partial(attribute, type=float, default=0.0)
 
 
 def List(item_type=typing.Any, default=attr.NOTHING, validator=None,
@@ -6,13 +6,18 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
-import calendar
 from datetime import datetime
+from datetime import timezone
 import os
 
 
+_UTC = timezone.utc
+
+
 def isoformat(utc_date):
-    return datetime.isoformat(utc_date).replace('T', ' ')
+    # the C-level isoformat handles the separator directly: no string
+    # replace pass over the result
+    return utc_date.isoformat(sep=' ')
 
 
 def get_file_mtime(location, iso=True):
@@ -25,7 +30,10 @@ def get_file_mtime(location, iso=True):
     if not os.path.isdir(location):
         mtime = os.stat(location).st_mtime
         if iso:
-            utc_date = datetime.utcfromtimestamp(mtime)
+            # fromtimestamp with an explicit UTC zone replaces the
+            # deprecated utcfromtimestamp; drop the tzinfo to keep the
+            # timestamp string free of a +00:00 offset suffix
+            utc_date = datetime.fromtimestamp(mtime, tz=_UTC).replace(tzinfo=None)
             date = isoformat(utc_date)
         else:
             date = str(mtime)
@@ -37,5 +45,5 @@ def secs_from_epoch(d):
     Return a number of seconds since epoch for a date time stamp
     """
     # FIXME: what does this do?
-    return calendar.timegm(datetime.strptime(d.split('.')[0],
-                                    '%Y-%m-%d %H:%M:%S').timetuple())
+    dt = datetime.fromisoformat(d.split('.')[0])
+    return int(dt.replace(tzinfo=timezone.utc).timestamp())
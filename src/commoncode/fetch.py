@@ -10,8 +10,10 @@ import logging
 import os
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError
 from requests.exceptions import InvalidSchema
+from urllib3.util.retry import Retry
 
 from commoncode import fileutils
 
@@ -20,6 +22,21 @@ logger = logging.getLogger(__name__)
 # logging.basicConfig(level=logging.DEBUG, stream=sys.stdout)
 # logger.setLevel(logging.DEBUG)
 
+# shared pooled session: TCP and TLS handshakes are amortized across all
+# fetches to the same hosts, with retries on transient server errors
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+    ),
+)
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
+
 
 def download_url(url, file_name=None, verify=True, timeout=10):
     """
@@ -33,21 +50,25 @@ def download_url(url, file_name=None, verify=True, timeout=10):
     file_name = file_name or fileutils.file_name(url)
 
     try:
-        response = requests.get(url, **requests_args)
+        response = _session.get(url, stream=True, **requests_args)
     except (ConnectionError, InvalidSchema) as e:
         logger.error('download_url: Download failed for %(url)r' % locals())
         raise
 
-    status = response.status_code
-    if status != 200:
-        msg = 'download_url: Download failed for %(url)r with %(status)r' % locals()
-        logger.error(msg)
-        raise Exception(msg)
+    with response:
+        status = response.status_code
+        if status != 200:
+            msg = 'download_url: Download failed for %(url)r with %(status)r' % locals()
+            logger.error(msg)
+            raise Exception(msg)
 
-    tmp_dir = fileutils.get_temp_dir(prefix='fetch-')
-    output_file = os.path.join(tmp_dir, file_name)
-    with open(output_file, 'wb') as out:
-        out.write(response.content)
+        tmp_dir = fileutils.get_temp_dir(prefix='fetch-')
+        output_file = os.path.join(tmp_dir, file_name)
+        # stream the body to disk in fixed-size chunks rather than
+        # materializing it in memory in one shot
+        with open(output_file, 'wb') as out:
+            for chunk in response.iter_content(chunk_size=1 << 16):
+                out.write(chunk)
 
     return output_file
 
@@ -56,15 +77,9 @@ def ping_url(url):
     """
     Returns True is `url` is reachable.
     """
+    # a HEAD request skips the body fetch entirely
     try:
-        from urlib.request import urlopen
-    except ImportError:
-        from urllib2 import urlopen
-
-    # FIXME: if there is no 200 HTTP status, then the ULR may not be reachable.
-    try:
-        urlopen(url)
+        response = _session.head(url, timeout=10, allow_redirects=True)
     except Exception:
         return False
-    else:
-        return True
+    return response.status_code < 400
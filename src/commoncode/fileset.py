@@ -7,7 +7,9 @@
 #
 
 import fnmatch
+import functools
 import os
+import re
 
 from commoncode import fileutils
 from commoncode import paths
@@ -68,6 +70,10 @@ def is_included(path, includes=None, excludes=None):
 
     The ordering of the includes and excludes items does not matter and if a map
     is empty, it is not used for matching.
+
+    Matching is purely lexical: the `path` string is never checked for
+    existence, so callers iterating a directory tree pay no extra stat
+    syscall per checked path.
     """
     if not path or not path.strip():
         return False
@@ -75,10 +81,13 @@ def is_included(path, includes=None, excludes=None):
     if not includes and not excludes:
         return True
 
+    # filter out empty patterns, rebuilding a mapping only when needed
     includes = includes or {}
-    includes = {k: v for k, v in includes.items() if k}
+    if not all(includes):
+        includes = {k: v for k, v in includes.items() if k}
     excludes = excludes or {}
-    excludes = {k: v for k, v in excludes.items() if k}
+    if not all(excludes):
+        excludes = {k: v for k, v in excludes.items() if k}
 
     if includes:
         included = get_matches(path, includes, all_matches=False)
@@ -117,37 +126,96 @@ def get_matches(path, patterns, all_matches=False):
     if TRACE:
         logger.debug('_match: path: %(path)r patterns:%(patterns)r.' % locals())
 
-    matches = []
     if not isinstance(patterns, dict):
         assert isinstance(patterns, (list, tuple)), 'Invalid patterns: {}'.format(patterns)
         patterns = {p: p for p in patterns}
 
-    for pat, value in patterns.items():
-        if not pat or not pat.strip():
-            continue
+    # normalize the patterns once, keeping their values by position
+    normalized = [
+        (_normalize(pat), value or '')
+        for pat, value in patterns.items()
+        if pat and pat.strip()
+    ]
+    if not normalized:
+        return [] if all_matches else False
 
-        value = value or ''
-        pat = pat.lstrip('/').lower()
-        is_plain = '/' not in pat
+    if not all_matches:
+        # match all patterns at once with cached union regexes: the first
+        # matching pattern in declaration order wins, as with the loop below
+        literals, plain_regex, path_regex = _compile_unions(
+            tuple(p for p, _ in normalized))
+        matched = None
+        if literals:
+            # wildcard-free patterns are plain segment names: one hash
+            # lookup per segment instead of a regex evaluation
+            for segment in segments:
+                index = literals.get(segment)
+                if index is not None and (matched is None or index < matched):
+                    matched = index
+        if plain_regex:
+            for segment in segments:
+                match = plain_regex.match(segment)
+                if match:
+                    index = int(match.lastgroup[1:])
+                    if matched is None or index < matched:
+                        matched = index
+        if path_regex:
+            match = path_regex.match(path) or path_regex.match(pathstripped)
+            if match:
+                index = int(match.lastgroup[1:])
+                if matched is None or index < matched:
+                    matched = index
+        if TRACE:
+            logger.debug('_match: matched: %(matched)r' % locals())
+        if matched is None:
+            return False
+        return normalized[matched][1]
 
-        if is_plain:
+    matches = []
+    for pat, value in normalized:
+        if '/' not in pat:
             if any(fnmatch.fnmatchcase(s, pat) for s in segments):
                 matches.append(value)
-                if not all_matches:
-                    break
         elif (fnmatch.fnmatchcase(path, pat) or fnmatch.fnmatchcase(pathstripped, pat)):
             matches.append(value)
-            if not all_matches:
-                break
     if TRACE:
         logger.debug('_match: matches: %(matches)r' % locals())
+    return matches
 
-    if not all_matches:
-        if matches:
-            return matches[0]
+
+@functools.lru_cache(maxsize=2048)
+def _normalize(pat):
+    """
+    Return the `pat` pattern normalized for matching: no leading slash and
+    lowercased.
+    """
+    return pat.lstrip('/').lower()
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_unions(pats):
+    """
+    Return a triple of (literals, plain_regex, path_regex) matchers for the
+    `pats` tuple of normalized fnmatch patterns. `literals` maps
+    wildcard-free plain patterns to their position for exact segment
+    lookups. The regexes are unions of the remaining patterns, or None when
+    empty: plain patterns (without a /) are matched against single path
+    segments and path patterns against whole paths. Each pattern is wrapped
+    in a named group p<index> so a match maps back to its pattern position.
+    """
+    literals = {}
+    plain = []
+    with_path = []
+    for index, pat in enumerate(pats):
+        if '/' in pat:
+            with_path.append('(?P<p%d>%s)' % (index, fnmatch.translate(pat)))
+        elif not any(wildcard in pat for wildcard in '*?['):
+            literals.setdefault(pat, index)
         else:
-            return False
-    return matches
+            plain.append('(?P<p%d>%s)' % (index, fnmatch.translate(pat)))
+    plain_regex = re.compile('|'.join(plain)) if plain else None
+    path_regex = re.compile('|'.join(with_path)) if with_path else None
+    return literals, plain_regex, path_regex
 
 
 def load(location):
@@ -159,9 +227,11 @@ def load(location):
     fn = os.path.abspath(os.path.normpath(os.path.expanduser(location)))
     msg = ('File %(location)s does not exist or not a file.') % locals()
     assert (os.path.exists(fn) and os.path.isfile(fn)), msg
-    mode = 'r'
-    with open(fn, mode) as f:
-        return [l.strip() for l in f if l and l.strip()]
+    # read the whole file once and split in a single pass rather than
+    # iterating and stripping line by line
+    with open(fn) as f:
+        content = f.read()
+    return [s for s in (line.strip() for line in content.splitlines()) if s]
 
 
 def includes_excludes(patterns, message):
@@ -186,8 +256,8 @@ def includes_excludes(patterns, message):
         if pat.startswith(BANG):
             cpat = pat.lstrip(BANG)
             if cpat:
-                excluded[cpat] = message
+                excluded[_normalize(cpat)] = message
             continue
         else:
-            included.add[pat] = message
+            included[_normalize(pat)] = message
     return included, excluded
@@ -7,10 +7,10 @@
 #
 
 import os
-from datetime import datetime
+import stat
+import time
 
 from commoncode.system import on_posix
-from commoncode.functional import memoize
 
 """
 Low level file type utilities, essentially a wrapper around os.path and stat.
@@ -21,27 +21,45 @@ def is_link(location):
     """
     Return True if `location` is a symbolic link.
     """
-    return location and os.path.islink(location)
+    if not location:
+        return False
+    mode = _lstat_mode(location)
+    return mode is not None and stat.S_ISLNK(mode)
+
+
+def _lstat_mode(location):
+    """
+    Return the lstat mode of `location` or None if it does not exist.
+    """
+    try:
+        return os.lstat(location).st_mode
+    except OSError:
+        return None
 
 
 def is_file(location, follow_symlinks=False):
     """
     Return True if `location` is a file.
     """
-    _is_file = location and os.path.isfile(location)
+    if not location:
+        return False
     if follow_symlinks:
-        return _is_file
-    return _is_file and not is_link(location) and not is_broken_link(location)
+        return os.path.isfile(location)
+    # a single lstat: a regular file is neither a link nor a broken link
+    mode = _lstat_mode(location)
+    return mode is not None and stat.S_ISREG(mode)
 
 
 def is_dir(location, follow_symlinks=False):
     """
     Return True if `location` is a directory.
     """
-    _is_dir = location and os.path.isdir(location) and not is_file(location)
+    if not location:
+        return False
     if follow_symlinks:
-        return _is_dir
-    return _is_dir and not is_link(location) and not is_broken_link(location)
+        return os.path.isdir(location) and not is_file(location)
+    mode = _lstat_mode(location)
+    return mode is not None and stat.S_ISDIR(mode)
 
 
 def is_regular(location):
@@ -49,7 +67,10 @@ def is_regular(location):
     Return True if `location` is regular. A regular location is a file or a
     dir and not a special file or symlink.
     """
-    return location and (is_file(location) or is_dir(location))
+    if not location:
+        return False
+    mode = _lstat_mode(location)
+    return mode is not None and (stat.S_ISREG(mode) or stat.S_ISDIR(mode))
 
 
 def is_special(location):
@@ -65,8 +86,7 @@ def is_broken_link(location):
     """
     Return True if `location` is a broken link.
     """
-    # always false on windows, until Python supports junctions/links
-    if on_posix and is_link(location):
+    if is_link(location):
         target = get_link_target(location)
         target_loc = os.path.join(os.path.dirname(location), target)
         return target and not os.path.exists(target_loc)
@@ -78,8 +98,7 @@ def get_link_target(location):
     string.
     """
     target = ''
-    # always false on windows, until Python supports junctions/links
-    if on_posix and is_link(location):
+    if is_link(location):
         try:
             # return false on OSes not supporting links
             target = os.readlink(location)
@@ -89,14 +108,40 @@ def get_link_target(location):
     return target
 
 
-# Map of type checker function -> short type code
+if not on_posix:
+    # links are not supported on Windows, until Python supports
+    # junctions/links: bind constant results at import time so each call
+    # skips the platform branch entirely
+
+    def is_broken_link(location):  # NOQA
+        return False
+
+    def get_link_target(location):  # NOQA
+        return ''
+
+
+# Map of short type code -> long type name
 # The order of types check matters: link -> file -> directory -> special
-TYPES = dict([
-    (is_link, ('l', 'link',)),
-    (is_file, ('f', 'file',)),
-    (is_dir, ('d', 'directory',)),
-    (is_special, ('s', 'special',))
-])
+TYPE_NAMES = {
+    'l': 'link',
+    'f': 'file',
+    'd': 'directory',
+    's': 'special',
+}
+
+
+def _classify(mode):
+    """
+    Return the single character type code for a stat `mode`: link, file,
+    directory or special.
+    """
+    if stat.S_ISLNK(mode):
+        return 'l'
+    if stat.S_ISREG(mode):
+        return 'f'
+    if stat.S_ISDIR(mode):
+        return 'd'
+    return 's'
 
 
 def get_type(location, short=True):
@@ -104,12 +149,36 @@ def get_type(location, short=True):
     Return the type of the `location` or None if it does not exist.
     Return the short form (single character) or long form if short=False
     """
-    if location:
-        for type_checker in TYPES:
-            tc = type_checker(location)
-            if tc:
-                short_form, long_form = TYPES[type_checker]
-                return short and short_form or long_form
+    if not location:
+        return
+    # a single lstat call instead of one syscall per type checker
+    mode = _lstat_mode(location)
+    if mode is None:
+        # a non-existent location is not regular, as with is_special
+        code = 's'
+    else:
+        code = _classify(mode)
+    return code if short else TYPE_NAMES[code]
+
+
+_RUSR = stat.S_IRUSR
+_WUSR = stat.S_IWUSR
+_XUSR = stat.S_IXUSR
+
+
+def _has_perms(location, file_bits, dir_bits):
+    """
+    Return True if the `location` owner mode has all of the `file_bits`
+    permission bits set for a file or the `dir_bits` bits for a directory.
+    A single lstat answers both the type dispatch and the permission mask.
+    """
+    if not location:
+        return False
+    mode = _lstat_mode(location)
+    if mode is None:
+        return False
+    bits = dir_bits if stat.S_ISDIR(mode) else file_bits
+    return (mode & bits) == bits
 
 
 def is_readable(location):
@@ -117,11 +186,7 @@ def is_readable(location):
     Return True if the file at location has readable permission set.
     Does not follow links.
     """
-    if location:
-        if is_dir(location):
-            return os.access(location, os.R_OK | os.X_OK)
-        else:
-            return os.access(location, os.R_OK)
+    return _has_perms(location, _RUSR, _RUSR | _XUSR)
 
 
 def is_writable(location):
@@ -129,11 +194,7 @@ def is_writable(location):
     Return True if the file at location has writeable permission set.
     Does not follow links.
     """
-    if location:
-        if is_dir(location):
-            return os.access(location, os.R_OK | os.W_OK | os.X_OK)
-        else:
-            return os.access(location, os.R_OK | os.W_OK)
+    return _has_perms(location, _RUSR | _WUSR, _RUSR | _WUSR | _XUSR)
 
 
 def is_executable(location):
@@ -141,11 +202,7 @@ def is_executable(location):
     Return True if the file at location has executable permission set.
     Does not follow links.
     """
-    if location:
-        if is_dir(location):
-            return os.access(location, os.R_OK | os.W_OK | os.X_OK)
-        else:
-            return os.access(location, os.X_OK)
+    return _has_perms(location, _XUSR, _RUSR | _WUSR | _XUSR)
 
 
 def is_rwx(location):
@@ -153,7 +210,7 @@ def is_rwx(location):
     Return True if the file at location has read, write and executable
     permission set. Does not follow links.
     """
-    return is_readable(location) and is_writable(location) and is_executable(location)
+    return _has_perms(location, _RUSR | _WUSR | _XUSR, _RUSR | _WUSR | _XUSR)
 
 
 def get_last_modified_date(location):
@@ -161,13 +218,17 @@ def get_last_modified_date(location):
     Return the last modified date stamp of a file as YYYYMMDD format. The date
     of non-files (dir, links, special) is always an empty string.
     """
-    yyyymmdd = ''
-    if is_file(location):
-        utc_date = datetime.isoformat(
-            datetime.utcfromtimestamp(os.path.getmtime(location))
-        )
-        yyyymmdd = utc_date[:10]
-    return yyyymmdd
+    if not location:
+        return ''
+    # a single lstat provides both the file check and the mtime, and
+    # strftime formats the date directly without a datetime allocation
+    try:
+        st = os.lstat(location)
+    except OSError:
+        return ''
+    if not stat.S_ISREG(st.st_mode):
+        return ''
+    return time.strftime('%Y-%m-%d', time.gmtime(st.st_mtime))
 
 
 counting_functions = {
@@ -176,7 +237,6 @@ counting_functions = {
 }
 
 
-@memoize
 def counter(location, counting_function):
     """
     Return a count for a single file or a cumulative count for a directory
@@ -184,8 +244,11 @@ def counter(location, counting_function):
 
     Get a callable from the counting_functions registry using the
     `counting_function` string. Call this callable with a `location` argument
-    to determine the count value for a single file. This allow memoization
-    with hashable arguments.
+    to determine the count value for a single file.
+
+    Counts are not cached: locations rarely recur within a scan and a cache
+    keyed on them would only grow for the lifetime of the process while
+    returning stale counts for changed trees.
 
     Only regular files and directories have a count. The count for a directory
     is the recursive count sum of the directory file and directory
@@ -194,16 +257,36 @@ def counter(location, counting_function):
     Any other file type such as a special file or link has a zero size. Does
     not follow links.
     """
-    if not (is_file(location) or is_dir(location)):
-        return 0
-
-    count = 0
     if is_file(location):
         count_fun = counting_functions[counting_function]
         return count_fun(location)
-    elif is_dir(location):
-        count += sum(counter(os.path.join(location, p), counting_function)
-                     for p in os.listdir(location))
+
+    if not is_dir(location):
+        return 0
+
+    # walk iteratively with scandir: the DirEntry type and stat data come
+    # from the directory read itself, avoiding extra syscalls per child
+    count_files = counting_function == 'file_count'
+    count_size = counting_function == 'file_size'
+    count_fun = counting_functions[counting_function]
+    count = 0
+    dirs = [location]
+    while dirs:
+        current = dirs.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        if count_files:
+                            count += 1
+                        elif count_size:
+                            count += entry.stat(follow_symlinks=False).st_size
+                        else:
+                            count += count_fun(entry.path)
+        except OSError:
+            continue
     return count
 
 
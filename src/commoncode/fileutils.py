@@ -6,15 +6,19 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
-import errno
+import fnmatch
+import functools
 import os
 import ntpath
 import posixpath
+import re
 import shutil
 import stat
 import sys
 import tempfile
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from os import fsdecode
 
 try:
@@ -24,6 +28,7 @@ except ImportError:
 
 from commoncode import filetype
 from commoncode.filetype import is_rwx
+from commoncode.system import on_posix
 
 # this exception is not available on posix
 try:
@@ -71,29 +76,16 @@ def create_dir(location):
             err = ('Cannot create directory: existing file '
                    'in the way ''%(location)s.')
             raise OSError(err % locals())
-    else:
-        # may fail on win if the path is too long
-        # FIXME: consider using UNC ?\\ paths
+        return
 
-        try:
-            os.makedirs(location)
-            chmod(location, RW, recurse=False)
-
-        # avoid multi-process TOCTOU conditions when creating dirs
-        # the directory may have been created since the exist check
-        except WindowsError as e:
-            # [Error 183] Cannot create a file when that file already exists
-            if e and e.winerror == 183:
-                if not os.path.isdir(location):
-                    raise
-            else:
-                raise
-        except (IOError, OSError) as o:
-            if o.errno == errno.EEXIST:
-                if not os.path.isdir(location):
-                    raise
-            else:
-                raise
+    # may fail on win if the path is too long
+    # FIXME: consider using UNC ?\\ paths
+
+    # exist_ok handles multi-process TOCTOU conditions directly: a
+    # directory created since the exist check above is not an error,
+    # while an existing file in the way still raises
+    os.makedirs(location, exist_ok=True)
+    chmod(location, RW, recurse=False)
 
 
 def get_temp_dir(base_dir=_base_temp_dir, prefix=''):
@@ -129,14 +121,15 @@ def get_temp_dir(base_dir=_base_temp_dir, prefix=''):
 
 def prepare_path(pth):
     """
-    Return the `pth` path string either as encoded bytes if on Linux and using
-    Python 2 or as a unicode/text otherwise.
+    Return the `pth` path as a unicode/text string, decoding bytes paths
+    with the filesystem encoding.
     """
     if not isinstance(pth, str):
         return fsdecode(pth)
     return pth
 
 
+@functools.lru_cache(maxsize=16384)
 def is_posixpath(location):
     """
     Return True if the `location` path is likely a POSIX-like path using POSIX path
@@ -145,8 +138,11 @@ def is_posixpath(location):
     Return False if the `location` path is likely a Windows-like path using backslash
     as path separators (e.g. "\").
     """
-    has_slashes = '/' in location
-    has_backslashes = '\\' in location
+    # fast path: without a backslash, a drive colon or a UNC-style //
+    # prefix the path is POSIX, with no splitdrive call at all
+    if '\\' not in location and ':' not in location and not location.startswith('//'):
+        return True
+
     # windows paths with drive
     if location:
         drive, _ = ntpath.splitdrive(location)
@@ -155,10 +151,7 @@ def is_posixpath(location):
 
     # a path is always POSIX unless it contains ONLY backslahes
     # which is a rough approximation (it could still be posix)
-    is_posix = True
-    if has_backslashes and not has_slashes:
-        is_posix = False
-    return is_posix
+    return not ('\\' in location and '/' not in location)
 
 
 def as_posixpath(location):
@@ -168,6 +161,10 @@ def as_posixpath(location):
     accepts gracefully POSIX paths on Windows.
     """
     location = prepare_path(location)
+    if '\\' not in location:
+        # the common case on POSIX: nothing to convert, skip the scan and
+        # new-string allocation of replace
+        return location
     return location.replace('\\', '/')
 
 
@@ -177,9 +174,12 @@ def as_winpath(location):
     `location` path.
     """
     location = prepare_path(location)
+    if '/' not in location:
+        return location
     return location.replace('/', '\\')
 
 
+@functools.lru_cache(maxsize=16384)
 def split_parent_resource(path, force_posix=False):
     """
     Return a tuple of (parent directory path, resource name).
@@ -199,11 +199,10 @@ def resource_name(path, force_posix=False):
     return right or ''
 
 
-def file_name(path, force_posix=False):
-    """
-    Return the file name (or directory name) of a path.
-    """
-    return resource_name(path, force_posix)
+# The file name (or directory name) of a path is its resource name: bind
+# the same function object directly rather than paying a delegating Python
+# frame on every call of this hot helper.
+file_name = resource_name
 
 
 def parent_directory(path, force_posix=False, with_trail=True):
@@ -260,11 +259,16 @@ def splitext_name(file_name, is_file=True):
 
 
 # TODO: FIXME: this is badly broken!!!!
+@functools.lru_cache(maxsize=16384)
 def splitext(path, force_posix=False):
     """
     Return a tuple of strings (basename, extension) for a path. The basename is
     the file name minus its extension. Return an empty extension string for a
     directory.
+
+    Results are cached: scan loops decompose the same path several times
+    through file_name, file_base_name and file_extension and each unique
+    path is now split only once.
     """
     base_name = ''
     extension = ''
@@ -299,6 +303,37 @@ def ignore_nothing(_):
     return False
 
 
+def ignore_names(names):
+    """
+    Return an `ignored` callable for walk, file_iter and resource_iter that
+    ignores any location whose file name is in the `names` collection. The
+    per-entry check is a single frozenset lookup running in C.
+    """
+    names = frozenset(names)
+    contains = names.__contains__
+
+    def is_ignored(location):
+        return contains(os.path.basename(location))
+
+    return is_ignored
+
+
+def ignore_globs(*patterns):
+    """
+    Return an `ignored` callable for walk, file_iter and resource_iter that
+    ignores any location whose file name matches one of the `patterns` glob
+    patterns. The patterns are compiled once into a single union regex so
+    the per-entry check runs in the regex engine, not in Python bytecode.
+    """
+    matcher = re.compile(
+        '|'.join(fnmatch.translate(p) for p in patterns)).match
+
+    def is_ignored(location):
+        return matcher(os.path.basename(location)) is not None
+
+    return is_ignored
+
+
 def walk(location, ignored=None, follow_symlinks=False):
     """
     Walk location returning the same tuples as os.walk but with a different
@@ -313,43 +348,104 @@ def walk(location, ignored=None, follow_symlinks=False):
     If `follow_symlinks` is True, then symlinks will not be ignored and be
     collected like regular files and directories
     """
-    # TODO: consider using the new "scandir" module for some speed-up.
-
     is_ignored = ignored(location) if ignored else False
     if is_ignored:
         if TRACE:
             logger_debug('walk: ignored:', location, is_ignored)
         return
 
-    if filetype.is_file(location, follow_symlinks=follow_symlinks) :
+    if filetype.is_file(location, follow_symlinks=follow_symlinks):
         yield parent_directory(location), [], [file_name(location)]
+        return
 
-    elif filetype.is_dir(location, follow_symlinks=follow_symlinks):
+    if not filetype.is_dir(location, follow_symlinks=follow_symlinks):
+        return
+
+    # walk with an explicit queue rather than recursion, scanning each
+    # directory once: the DirEntry type data comes from the directory read
+    # itself so classifying an entry costs at most one lstat
+    queue = deque([location])
+    while queue:
+        current = queue.popleft()
         dirs = []
+        subdirs = []
         files = []
-        # TODO: consider using scandir
-        for name in os.listdir(location):
-            loc = os.path.join(location, name)
-            if filetype.is_special(loc) or (ignored and ignored(loc)):
-                if (follow_symlinks
-                        and filetype.is_link(loc)
-                        and not filetype.is_broken_link(location)):
-                    pass
-                else:
-                    if TRACE:
-                        ign = ignored and ignored(loc)
-                        logger_debug('walk: ignored:', loc, ign)
-                    continue
-            # special files and symlinks are always ignored
-            if filetype.is_dir(loc, follow_symlinks=follow_symlinks):
-                dirs.append(name)
-            elif filetype.is_file(loc, follow_symlinks=follow_symlinks):
-                files.append(name)
-        yield location, dirs, files
-
-        for dr in dirs:
-            for tripple in walk(os.path.join(location, dr), ignored, follow_symlinks=follow_symlinks):
-                yield tripple
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    loc = entry.path
+                    is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+                    is_file = (
+                        not is_dir
+                        and entry.is_file(follow_symlinks=follow_symlinks))
+                    if follow_symlinks:
+                        is_regular = (
+                            entry.is_file(follow_symlinks=False)
+                            or entry.is_dir(follow_symlinks=False))
+                    else:
+                        is_regular = is_dir or is_file
+                    if not is_regular or (ignored and ignored(loc)):
+                        # special files and symlinks are always ignored
+                        # unless symlinks are followed
+                        if not (follow_symlinks and entry.is_symlink()):
+                            if TRACE:
+                                ign = ignored and ignored(loc)
+                                logger_debug('walk: ignored:', loc, ign)
+                            continue
+                    if is_dir:
+                        dirs.append(entry.name)
+                        subdirs.append(loc)
+                    elif is_file:
+                        files.append(entry.name)
+        except OSError:
+            pass
+        yield current, dirs, files
+        queue.extend(subdirs)
+
+
+def file_iter(location, ignored=ignore_nothing, follow_symlinks=False):
+    """
+    Return an iterable of file paths at `location` recursively, with the
+    same traversal and ignore behavior as walk but without materializing
+    the intermediate name lists and re-joined paths of its triples.
+    """
+    if ignored and ignored(location):
+        return
+
+    if filetype.is_file(location, follow_symlinks=follow_symlinks):
+        yield os.path.join(parent_directory(location), file_name(location))
+        return
+
+    if not filetype.is_dir(location, follow_symlinks=follow_symlinks):
+        return
+
+    queue = deque([location])
+    while queue:
+        current = queue.popleft()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    loc = entry.path
+                    # classify once from the cached DirEntry data, as in walk
+                    is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+                    is_file = (
+                        not is_dir
+                        and entry.is_file(follow_symlinks=follow_symlinks))
+                    if follow_symlinks:
+                        is_regular = (
+                            entry.is_file(follow_symlinks=False)
+                            or entry.is_dir(follow_symlinks=False))
+                    else:
+                        is_regular = is_dir or is_file
+                    if not is_regular or (ignored and ignored(loc)):
+                        if not (follow_symlinks and entry.is_symlink()):
+                            continue
+                    if is_dir:
+                        queue.append(loc)
+                    elif is_file:
+                        yield loc
+        except OSError:
+            pass
 
 
 def resource_iter(location, ignored=ignore_nothing, with_dirs=True, follow_symlinks=False):
@@ -359,14 +455,53 @@ def resource_iter(location, ignored=ignore_nothing, with_dirs=True, follow_symli
     :param location: a file or a directory.
     :param ignored: a callable accepting a location argument and returning True
                     if the location should be ignored.
-    :return: an iterable of file and directory locations.
+    :return: an iterable of file and directory locations as plain strings.
+        No Path object is ever constructed per entry: callers that want one
+        can wrap the yielded strings themselves.
     """
+    if not with_dirs:
+        yield from file_iter(location, ignored, follow_symlinks=follow_symlinks)
+        return
+
     for top, dirs, files in walk(location, ignored, follow_symlinks=follow_symlinks):
-        if with_dirs:
-            for d in dirs:
-                yield os.path.join(top, d)
+        for d in dirs:
+            yield os.path.join(top, d)
         for f in files:
             yield os.path.join(top, f)
+#
+# READING
+#
+
+
+def file_chunks(file_object, chunk_size=1 << 20):
+    """
+    Return an iterable of byte chunks read from the `file_object` opened in
+    binary mode, reading `chunk_size` bytes at a time. The sentinel form of
+    iter() loops entirely in C and the 1 MiB default chunk matches modern
+    filesystem readahead.
+    """
+    return iter(functools.partial(file_object.read, chunk_size), b'')
+
+
+def read_text_file(location, encoding='utf-8', universal_new_lines=True):
+    """
+    Return the text content of the file at `location` decoded using
+    `encoding`, falling back to latin-1 (which cannot fail) if the content
+    does not decode. Normalize line endings to newlines if
+    `universal_new_lines` is True.
+
+    The io module translates newlines in C while decoding rather than
+    re-joining split lines in a second full-size allocation.
+    """
+    newline = None if universal_new_lines else ''
+    try:
+        with open(location, encoding=encoding, errors='strict', newline=newline) as f:
+            return f.read()
+    except UnicodeDecodeError:
+        with open(location, encoding='latin-1', newline=newline) as f:
+            return f.read()
+
+
 #
 # COPY
 #
@@ -388,8 +523,68 @@ def copytree(src, dst):
     """
     if not filetype.is_readable(src):
         chmod(src, R, recurse=False)
+    if on_posix:
+        _copytree_fwalk(src, dst)
+    else:
+        _copytree_recursive(src, dst)
+
+
+def _copytree_fwalk(src, dst):
+    """
+    Copy the `src` directory tree to `dst` in a single os.fwalk pass. Each
+    source entry is stated relative to the open directory fd, so the kernel
+    pathname lookup does not re-walk the whole path per entry as it does
+    with recursion from the tree root.
+    """
+    src = os.fspath(src)
+    errors = []
+
+    for dirpath, dirs, files, dfd in os.fwalk(src):
+        rel = os.path.relpath(dirpath, src)
+        dstdir = dst if rel == os.curdir else os.path.join(dst, rel)
+        try:
+            if not os.path.exists(dstdir):
+                os.makedirs(dstdir)
+            errors.extend(copytime(dirpath, dstdir))
+        except EnvironmentError as why:
+            errors.append((dirpath, dstdir, str(why)))
+            continue
+
+        # make unreadable subdirs traversable before fwalk descends into
+        # them; symlinked dirs are not descended into and not copied
+        for name in dirs:
+            try:
+                st = os.stat(name, dir_fd=dfd, follow_symlinks=False)
+                if stat.S_ISDIR(st.st_mode) and not st.st_mode & R:
+                    os.chmod(name, stat.S_IMODE(st.st_mode) | RWX, dir_fd=dfd)
+            except OSError:
+                continue
+
+        file_copies = []
+        for name in files:
+            try:
+                st = os.stat(name, dir_fd=dfd, follow_symlinks=False)
+            except OSError:
+                continue
+            # skip anything that is not a regular file such as links and
+            # special files
+            if stat.S_ISREG(st.st_mode):
+                file_copies.append(
+                    (os.path.join(dirpath, name), os.path.join(dstdir, name), st))
+        _copy_files(file_copies, errors)
+
+    if errors:
+        raise shutil.Error(errors)
+
 
-    names = os.listdir(src)
+def _copytree_recursive(src, dst):
+    """
+    Copy the `src` directory tree to `dst` by per-directory recursion, for
+    platforms without fd-relative syscalls.
+    """
+    # scan the source once: the cached DirEntry data classifies each entry
+    # without re-stating it several times per name
+    entries = list(os.scandir(src))
 
     if not os.path.exists(dst):
         os.makedirs(dst)
@@ -397,21 +592,22 @@ def copytree(src, dst):
     errors = []
     errors.extend(copytime(src, dst))
 
-    for name in names:
-        srcname = os.path.join(src, name)
-        dstname = os.path.join(dst, name)
-
-        # skip anything that is not a regular file, dir or link
-        if not filetype.is_regular(srcname):
-            continue
+    file_copies = []
+    for entry in entries:
+        srcname = entry.path
+        dstname = os.path.join(dst, entry.name)
 
-        if not filetype.is_readable(srcname):
-            chmod(srcname, R, recurse=False)
         try:
-            if os.path.isdir(srcname):
-                copytree(srcname, dstname)
-            elif filetype.is_file(srcname):
-                copyfile(srcname, dstname)
+            # skip anything that is not a regular file or dir such as
+            # links and special files
+            if entry.is_dir(follow_symlinks=False):
+                entry_stat = entry.stat(follow_symlinks=False)
+                if not entry_stat.st_mode & R:
+                    chmod(srcname, R, recurse=False)
+                _copytree_recursive(srcname, dstname)
+            elif entry.is_file(follow_symlinks=False):
+                file_copies.append(
+                    (srcname, dstname, entry.stat(follow_symlinks=False)))
         # catch the Error from the recursive copytree so that we can
         # continue with other files
         except shutil.Error as err:
@@ -419,26 +615,76 @@ def copytree(src, dst):
         except EnvironmentError as why:
             errors.append((srcname, dstname, str(why)))
 
+    _copy_files(file_copies, errors)
+
     if errors:
         raise shutil.Error(errors)
 
 
-def copyfile(src, dst):
+def _copy_files(file_copies, errors):
+    """
+    Copy the `file_copies` tuples of (src, dst, src_stat) for one directory
+    level, appending failures to the `errors` list.
+    """
+    if len(file_copies) < COPY_PARALLEL_THRESHOLD:
+        copy_errors = map(_copy_file_entry, file_copies)
+    else:
+        # the byte copies run in kernel space and release the GIL, so
+        # copying the files of a directory in parallel hides I/O latency,
+        # notably on network filesystems
+        with ThreadPoolExecutor(max_workers=min(8, len(file_copies))) as pool:
+            copy_errors = list(pool.map(_copy_file_entry, file_copies))
+    errors.extend(err for err in copy_errors if err)
+
+
+# minimum number of files in a directory before copying them in parallel:
+# below this the thread pool costs more than it saves
+COPY_PARALLEL_THRESHOLD = 8
+
+
+def _copy_file_entry(file_copy):
+    """
+    Copy one `file_copy` tuple of (src, dst, src_stat) for copytree. Return
+    an error tuple of (src, dst, message) or None on success.
+    """
+    src, dst, src_stat = file_copy
+    try:
+        if not src_stat.st_mode & R:
+            chmod(src, R, recurse=False)
+        copyfile(src, dst, src_stat=src_stat)
+    except EnvironmentError as why:
+        return src, dst, str(why)
+
+
+def copyfile(src, dst, src_stat=None):
     """
     Copy src file to dst file preserving timestamps.
     Ignore permissions and special files.
+    Use the optional `src_stat` lstat result of `src` if provided.
 
     Similar to and derived from Python shutil module. See fileutils.py.ABOUT
     for details.
     """
-    if not filetype.is_regular(src):
+    # a single lstat provides the regular-file check and the timestamps
+    # to copy, instead of separate stats for each
+    try:
+        st = src_stat if src_stat is not None else os.lstat(src)
+    except OSError:
         return
-    if not filetype.is_readable(src):
+    if not stat.S_ISREG(st.st_mode):
+        return
+    if not os.access(src, os.R_OK):
         chmod(src, R, recurse=False)
     if os.path.isdir(dst):
         dst = os.path.join(dst, os.path.basename(src))
+    # shutil.copyfile copies in kernel space (sendfile/copy_file_range on
+    # Linux, fcopyfile on macOS) since Python 3.8
     shutil.copyfile(src, dst)
-    copytime(src, dst)
+    try:
+        os.utime(dst, (st.st_atime, st.st_mtime))
+    except OSError:
+        # File access times cannot be copied on Windows
+        pass
 
 
 def copytime(src, dst):
@@ -450,15 +696,14 @@ def copytime(src, dst):
     """
     errors = []
     st = os.stat(src)
-    if hasattr(os, 'utime'):
-        try:
-            os.utime(dst, (st.st_atime, st.st_mtime))
-        except OSError as why:
-            if WindowsError is not None and isinstance(why, WindowsError):
-                # File access times cannot be copied on Windows
-                pass
-            else:
-                errors.append((src, dst, str(why)))
+    try:
+        os.utime(dst, (st.st_atime, st.st_mtime))
+    except OSError as why:
+        if isinstance(why, WindowsError):
+            # File access times cannot be copied on Windows
+            pass
+        else:
+            errors.append((src, dst, str(why)))
     return errors
 
 #
@@ -509,12 +754,42 @@ def chmod_tree(location, flags):
     """
     Update permissions recursively in a directory tree `location`.
     """
-    if filetype.is_dir(location):
+    if not filetype.is_dir(location):
+        return
+
+    if not on_posix:
         for top, dirs, files in walk(location):
             for d in dirs:
                 chmod(os.path.join(top, d), flags, recurse=False)
             for f in files:
                 chmod(os.path.join(top, f), flags, recurse=False)
+        return
+
+    location = os.path.abspath(location)
+    # make the tree root traversable once up front, instead of re-checking
+    # and re-stating the parent for every single entry as chmod does
+    if not is_rwx(location):
+        os.chmod(location, stat.S_IMODE(os.stat(location).st_mode) | RWX)
+
+    # a single top-down pass: each entry costs one stat and one fchmodat
+    # relative to the open directory fd, with no path re-joining
+    for top, dirs, files, topfd in os.fwalk(location):
+        for name in dirs:
+            try:
+                st = os.stat(name, dir_fd=topfd, follow_symlinks=False)
+            except OSError:
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                # POSIX dirs need to be executable to be readable,
+                # and to be writable so we can change perms of files inside
+                os.chmod(name, stat.S_IMODE(st.st_mode) | RWX, dir_fd=topfd)
+        for name in files:
+            try:
+                st = os.stat(name, dir_fd=topfd, follow_symlinks=False)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                os.chmod(name, stat.S_IMODE(st.st_mode) | flags, dir_fd=topfd)
 
 #
 # DELETION
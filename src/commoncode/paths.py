@@ -6,6 +6,7 @@
 # See https://aboutcode.org for more information about nexB OSS projects.
 #
 
+import functools
 import ntpath
 import posixpath
 import re
@@ -26,6 +27,20 @@ to OS-safe paths and to POSIX paths.
 # Build OS-portable and safer paths
 
 
+# a path segment needing no sanitization: only portable characters, not
+# made of dots only and not starting with a dotdot
+_SAFE_SEGMENT = r'(?!\.+(?:/|\Z))(?!\.\.)[A-Za-z0-9!#$%&()+,\-.;=@\[\]_{}~]+'
+_SAFE_PATH_MATCH = re.compile(
+    r'{seg}(?:/{seg})*\Z'.format(seg=_SAFE_SEGMENT)).match
+
+# a path segment needing no resolution: no separator, space, colon and
+# not a single dot or dotdot
+_RESOLVED_SEGMENT = r'(?!\.\.?(?:/|\Z))[^/\\\s:]+'
+_RESOLVED_PATH_MATCH = re.compile(
+    r'{seg}(?:/{seg})*\Z'.format(seg=_RESOLVED_SEGMENT)).match
+
+
+@functools.lru_cache(maxsize=16384)
 def safe_path(path, posix=False, preserve_spaces=False, posix_only=False):
     """
     Convert `path` to a safe and portable POSIX path usable on multiple OSes.
@@ -41,6 +56,17 @@ def safe_path(path, posix=False, preserve_spaces=False, posix_only=False):
     if not isinstance(path, str):
         path = as_unicode(path)
 
+    # fast path: most paths are already relative, resolved and portable
+    # and come out of the full pipeline unchanged
+    if _SAFE_PATH_MATCH(path) and (
+        posix_only
+        or not any(
+            s.partition('.')[0].lower() in ILLEGAL_WINDOWS_NAMES
+            for s in path.split('/')
+        )
+    ):
+        return path
+
     path = path.strip()
 
     if not is_posixpath(path):
@@ -68,6 +94,17 @@ def safe_path(path, posix=False, preserve_spaces=False, posix_only=False):
     return as_posixpath(path)
 
 
+def safe_path_many(paths, posix=False, preserve_spaces=False, posix_only=False):
+    """
+    Return a list with the safe_path() conversion of each path in the `paths`
+    iterable. A batched entry point for callers holding a whole collection:
+    one Python frame and one global lookup serve all paths, and repeated
+    prefixes hit the safe_path cache back to back.
+    """
+    sp = safe_path
+    return [sp(p, posix, preserve_spaces, posix_only) for p in paths]
+
+
 def path_handlers(path, posix=True):
     """
     Return a path module and path separator to use for handling (e.g. split and
@@ -96,6 +133,10 @@ def resolve(path, posix=True):
     if not path:
         return '.'
 
+    # fast path: no separator cleanup and no dot segment to resolve
+    if _RESOLVED_PATH_MATCH(path):
+        return path
+
     path = path.strip()
     if not path:
         return '.'
@@ -106,6 +147,31 @@ def resolve(path, posix=True):
 
     pathmod, path_sep = path_handlers(path, posix)
 
+    if path_sep == '/':
+        # a single linear pass with a stack: blank and dot segments are
+        # dropped, a dotdot pops the previous segment and an escaping
+        # dotdot becomes the literal 'dotdot'. POSIX paths have no drive
+        # or root special cases, so normpath is not needed here.
+        segments = []
+        for s in path.split('/'):
+            s = s.strip()
+            if not s or s == '.':
+                continue
+            if s == '..':
+                if segments and segments[-1] != 'dotdot':
+                    segments.pop()
+                else:
+                    segments.append('dotdot')
+            else:
+                segments.append(s)
+        if not segments:
+            return '.'
+        # a leading drive-like segment is made relative, as below
+        if len(segments[0]) == 2 and segments[0].endswith(':'):
+            segments[0] = segments[0][:-1]
+        # mixed-separator paths can leave backslashes inside segments
+        return as_posixpath('/'.join(segments))
+
     path = path.strip(path_sep)
     segments = [s.strip() for s in path.split(path_sep) if s.strip()]
 
@@ -114,7 +180,8 @@ def resolve(path, posix=True):
 
     path = path_sep.join(segments)
 
-    # resolves . dot, .. dotdot
+    # resolves . dot, .. dotdot: normpath handles the Windows drive and
+    # root semantics that a plain segment stack cannot
     path = pathmod.normpath(path)
 
     segments = path.split(path_sep)
@@ -160,13 +227,34 @@ replace_illegal_posix_chars = re.compile(posix_illegal_chars_re).sub
 replace_illegal_posix_chars_exc_spaces = re.compile(posix_illegal_chars_exc_spaces_re).sub
 
 
-ILLEGAL_WINDOWS_NAMES = set([
+def _illegal_char_table(replace_illegal_sub):
+    """
+    Return a str.translate table mapping every character that the
+    `replace_illegal_sub` compiled substitution would replace to an
+    underscore. Derived from the pattern itself so both stay in sync. The
+    input is ASCII after transliteration so 128 entries cover it fully.
+    """
+    return {c: '_' for c in range(128) if replace_illegal_sub('', chr(c)) == ''}
+
+
+# one table per (posix_only, preserve_spaces) combination: a single
+# C-level translate pass replaces the regex substitution
+_ILLEGAL_CHAR_TABLES = {
+    (False, False): _illegal_char_table(replace_illegal_chars),
+    (False, True): _illegal_char_table(replace_illegal_chars_exc_spaces),
+    (True, False): _illegal_char_table(replace_illegal_posix_chars),
+    (True, True): _illegal_char_table(replace_illegal_posix_chars_exc_spaces),
+}
+
+
+ILLEGAL_WINDOWS_NAMES = frozenset([
     'com1', 'com2', 'com3', 'com4', 'com5', 'com6', 'com7', 'com8', 'com9',
     'lpt1', 'lpt2', 'lpt3', 'lpt4', 'lpt5', 'lpt6', 'lpt7', 'lpt8', 'lpt9',
     'aux', 'con', 'nul', 'prn'
 ])
 
 
+@functools.lru_cache(maxsize=16384)
 def portable_filename(filename, preserve_spaces=False, posix_only=False):
     """
     Return a new name for `filename` that is portable across operating systems.
@@ -193,16 +281,8 @@ def portable_filename(filename, preserve_spaces=False, posix_only=False):
     if not filename:
         return '_'
 
-    if posix_only:
-        if preserve_spaces:
-            filename = replace_illegal_posix_chars_exc_spaces('_', filename)
-        else:
-            filename = replace_illegal_posix_chars('_', filename)
-    else:
-        if preserve_spaces:
-            filename = replace_illegal_chars_exc_spaces('_', filename)
-        else:
-            filename = replace_illegal_chars('_', filename)
+    filename = filename.translate(
+        _ILLEGAL_CHAR_TABLES[bool(posix_only), bool(preserve_spaces)])
 
     if not posix_only:
         basename, dot, extension = filename.partition('.')
@@ -245,13 +325,19 @@ def common_suffix(s1, s2):
     """
     if not s1 or not s2:
         return None, 0
-    # revert the seqs and get a common prefix
-    common, lgth = common_prefix(s1[::-1], s2[::-1])
-    # revert again
-    common = common[::-1] if common else common
-    return common, lgth
+    # walk both tails in place rather than reversing full copies of both
+    # sequences and reversing the result back
+    lgth = 0
+    for e1, e2 in zip(reversed(s1), reversed(s2)):
+        if e1 != e2:
+            break
+        lgth += 1
+    if not lgth:
+        return None, 0
+    return s1[len(s1) - lgth:], lgth
 
 
+@functools.lru_cache(maxsize=16384)
 def common_path_prefix(p1, p2):
     """
     Return the common leading path between two posix paths and the number of
@@ -260,6 +346,7 @@ def common_path_prefix(p1, p2):
     return _common_path(p1, p2, common_func=common_prefix)
 
 
+@functools.lru_cache(maxsize=16384)
 def common_path_suffix(p1, p2):
     """
     Return the common trailing path between two posix paths and the number of
@@ -279,12 +366,53 @@ def split(p):
     return [] if p == [''] else p
 
 
+@functools.lru_cache(maxsize=16384)
+def _split_segments(p):
+    """
+    Return the split() segments of `p` as a cached tuple. Prefix and suffix
+    comparisons typically repeat one side, such as a running common prefix
+    compared against every path of a scan, and skip the re-split entirely.
+    """
+    return tuple(split(p))
+
+
 def _common_path(p1, p2, common_func):
     """
     Return a common leading or trailing path brtween paths `p1` and `p2` and the
     common length in number of segments using the `common_func` path comparison
     function.
     """
-    common, lgth = common_func(split(p1), split(p2))
+    if p1 == p2:
+        # equal paths share themselves fully: no comparison loop needed
+        segments = _split_segments(p1)
+        if not segments:
+            return None, 0
+        return '/'.join(segments), len(segments)
+    common, lgth = common_func(_split_segments(p1), _split_segments(p2))
     common = '/'.join(common) if common else None
     return common, lgth
+
+
+def common_path_prefix_many(paths):
+    """
+    Return the common leading path of an iterable of posix `paths` and the
+    number of common segments, in a single O(total length) pass rather than
+    pairwise common_path_prefix calls.
+    """
+    prefix = None
+    for p in paths:
+        segments = _split_segments(p)
+        if prefix is None:
+            prefix = list(segments)
+            continue
+        matched = 0
+        for ours, theirs in zip(prefix, segments):
+            if ours != theirs:
+                break
+            matched += 1
+        del prefix[matched:]
+        if not prefix:
+            return None, 0
+    if not prefix:
+        return None, 0
+    return '/'.join(prefix), len(prefix)
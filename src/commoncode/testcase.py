@@ -7,6 +7,7 @@
 #
 
 import filecmp
+import functools
 import json
 import os
 import shutil
@@ -37,6 +38,9 @@ test_run_temp_dir = None
 # set to 1 to see the slow tests
 timing_threshold = sys.maxsize
 
+# version control directory names pruned from extracted test trees
+_VCS_DIRS = frozenset({'CVS', '.svn', '.git', '.hg'})
+
 
 def to_os_native_path(path):
     """
@@ -51,6 +55,16 @@ def to_os_native_path(path):
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _test_data_dir_exists(test_data_dir):
+    """
+    Return True if the `test_data_dir` directory exists. The result is
+    cached: the same few static data directories are probed for every
+    single test case collected.
+    """
+    return path.exists(test_data_dir)
+
+
 def get_test_loc(
     test_path,
     test_data_dir,
@@ -70,7 +84,7 @@ def get_test_loc(
     assert test_path
     assert test_data_dir
 
-    if not path.exists(test_data_dir):
+    if not _test_data_dir_exists(test_data_dir):
         raise IOError("[Errno 2] No such directory: test_data_dir not found:"
                       " '%(test_data_dir)s'" % locals())
 
@@ -175,21 +189,23 @@ class FileDrivenTesting(object):
         """
         Remove some version control directories and some temp editor files.
         """
-        vcses = ('CVS', '.svn', '.git', '.hg')
         for root, dirs, files in os.walk(test_dir):
-            for vcs_dir in vcses:
-                if vcs_dir in dirs:
-                    for vcsroot, vcsdirs, vcsfiles in os.walk(test_dir):
-                        for vcsfile in vcsdirs + vcsfiles:
-                            vfile = path.join(vcsroot, vcsfile)
-                            fileutils.chmod(vfile, fileutils.RW, recurse=False)
-                    shutil.rmtree(path.join(root, vcs_dir), False)
+            # one C-level set intersection per directory instead of a
+            # membership test per VCS name
+            for vcs_dir in _VCS_DIRS.intersection(dirs):
+                # chmod only the VCS directory being removed: the
+                # previous code re-walked the whole test tree from the
+                # top for every single VCS directory found
+                vcs_loc = path.join(root, vcs_dir)
+                fileutils.chmod(vcs_loc, fileutils.RW, recurse=True)
+                shutil.rmtree(vcs_loc, False)
+                # no need to descend in a directory we just removed
+                dirs.remove(vcs_dir)
 
             # editors temp file leftovers
-            tilde_files = [path.join(root, file_loc)
-                           for file_loc in files if file_loc.endswith('~')]
-            for tf in tilde_files:
-                os.remove(tf)
+            for file_loc in files:
+                if file_loc.endswith('~'):
+                    os.remove(path.join(root, file_loc))
 
     def __extract(self, test_path, extract_func=None, verbatim=False):
         """
@@ -263,6 +279,12 @@ def file_cmp(file1, file2, ignore_line_endings=False):
     Compare two files content.
     Return False if they differ, True is they are the same.
     """
+    if not ignore_line_endings:
+        # sizes first, then a chunked C-level compare: equal files never
+        # get fully buffered in memory
+        if filecmp.cmp(file1, file2, shallow=False):
+            return
+        # fall through to the full read so the assert shows the diff
     with open(file1, 'rb') as f1:
         f1c = f1.read()
         if ignore_line_endings:
@@ -305,6 +327,26 @@ def make_non_executable(location):
         os.chmod(location, current_stat & ~stat.S_IEXEC)
 
 
+def _walk_file_entries(test_dir):
+    """
+    Yield an os.DirEntry for each file under the `test_dir` tree. The
+    DirEntry name, path and type come from the directory read itself
+    without a stat syscall per file.
+    """
+    dirs = [test_dir]
+    while dirs:
+        current = dirs.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except OSError:
+            continue
+
+
 def get_test_file_pairs(test_dir):
     """
     Yield tuples of (data_file, test_file) from a test data `test_dir` directory.
@@ -321,29 +363,36 @@ def get_test_file_pairs(test_dir):
     dangling_data_files = set()
     paths_ignoring_case = defaultdict(list)
 
-    for top, _, files in os.walk(test_dir):
-        for tfile in files:
-            if tfile.endswith('~'):
-                continue
-            file_path = path.abspath(path.join(top, tfile))
-
-            if tfile.endswith('.yml'):
-                data_file_path = file_path
-                test_file_path = file_path.replace('.yml', '')
-            else:
-                test_file_path = file_path
-                data_file_path = test_file_path + '.yml'
-
-            if not path.exists(test_file_path):
-                dangling_test_files.add(test_file_path)
-
-            if not path.exists(data_file_path):
-                dangling_data_files.add(data_file_path)
-
-            paths_ignoring_case[file_path.lower()].append(file_path)
-
-            data_files[test_file_path] = data_file_path
-            test_files[test_file_path] = test_file_path
+    # enumerate all files first: most existence checks are then answered
+    # from this set instead of issuing one stat syscall per counterpart
+    all_file_paths = set()
+    walked = []
+    for entry in _walk_file_entries(test_dir):
+        tfile = entry.name
+        if tfile.endswith('~'):
+            continue
+        file_path = path.abspath(entry.path)
+        all_file_paths.add(file_path)
+        walked.append((tfile, file_path))
+
+    for tfile, file_path in walked:
+        if tfile.endswith('.yml'):
+            data_file_path = file_path
+            test_file_path = file_path.replace('.yml', '')
+        else:
+            test_file_path = file_path
+            data_file_path = test_file_path + '.yml'
+
+        if test_file_path not in all_file_paths and not path.exists(test_file_path):
+            dangling_test_files.add(test_file_path)
+
+        if data_file_path not in all_file_paths and not path.exists(data_file_path):
+            dangling_data_files.add(data_file_path)
+
+        paths_ignoring_case[file_path.lower()].append(file_path)
+
+        data_files[test_file_path] = data_file_path
+        test_files[test_file_path] = test_file_path
 
     # ensure that we haev no dangling files
     if dangling_test_files or dangling_data_files:
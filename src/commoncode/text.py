@@ -37,8 +37,17 @@ def lines(s):
     replace things where we want to split with line endings, then we
     splitlines.
     """
-    # FIXME: leverage new Pythin 3.8 scopeing rules
-    return [l.strip() for l in s.splitlines() if l.strip()]
+    return list(iter_lines(s))
+
+
+def iter_lines(s):
+    """
+    Yield stripped, non-empty lines from the string `s` with the same
+    conventions as lines() without materializing a list.
+    """
+    # strip each line exactly once with a C-level map: the stripped value
+    # serves as both the emptiness filter and the yielded value
+    return (stripped for stripped in map(str.strip, s.splitlines()) if stripped)
 
 
 def foldcase(text):
@@ -48,8 +57,19 @@ def foldcase(text):
     return text.lower()
 
 
+# compiled once at import: nopunctuation() is called for every name or
+# text fragment and recompiling this regex per call is pure overhead
+_NOPUNC_RE = re.compile(r'[\W_]', re.MULTILINE | re.UNICODE)
+
+
+# translation table mapping every non-alphanumeric ASCII character
+# (including underscore, as in the regex) to a space: for ASCII text a
+# single C-level str.translate pass replaces the regex state machine
+_ASCII_PUNC_TABLE = {c: 0x20 for c in range(128) if not chr(c).isalnum()}
+
+
 def nopunc():
-    return re.compile(r'[\W_]', re.MULTILINE | re.UNICODE)
+    return _NOPUNC_RE
 
 
 def nopunctuation(text):
@@ -60,7 +80,9 @@ def nopunctuation(text):
     """
     if not isinstance(text, str):
         text = as_unicode(text)
-    return re.sub(nopunc(), ' ', text)
+    if text.isascii():
+        return text.translate(_ASCII_PUNC_TABLE)
+    return _NOPUNC_RE.sub(' ', text)
 
 
 CR = '\r'
@@ -69,6 +91,10 @@ CRLF = CR + LF
 CRLF_NO_CR = ' ' + LF
 
 
+# single-pass translation table replacing both separators with a space
+_NOLINESEP_TABLE = {ord(CR): ' ', ord(LF): ' '}
+
+
 def unixlinesep(text, preserve=False):
     """
     Normalize a string to Unix line separators. Preserve character offset by
@@ -76,6 +102,9 @@ def unixlinesep(text, preserve=False):
     """
     if not isinstance(text, str):
         text = as_unicode(text)
+    if CR not in text:
+        # already using Unix separators: no string copies at all
+        return text
     return text.replace(CRLF, CRLF_NO_CR if preserve else LF).replace(CR, LF)
 
 
@@ -85,7 +114,7 @@ def nolinesep(text):
     """
     if not isinstance(text, str):
         text = as_unicode(text)
-    return text.replace(CR, ' ').replace(LF, ' ')
+    return text.translate(_NOLINESEP_TABLE)
 
 
 def toascii(s, translit=False):
@@ -107,6 +136,10 @@ def toascii(s, translit=False):
     """
     if not isinstance(s, str):
         s = as_unicode(s)
+    if s.isascii():
+        # already ASCII: NFKD and transliteration are both identity
+        # transforms and the encode/decode round-trip a plain copy
+        return s
     if translit:
         converted = unidecode(s)
     else:
@@ -117,19 +150,28 @@ def toascii(s, translit=False):
     return converted.decode('ascii')
 
 
+# translation table fusing the case folding and punctuation replacement
+# passes of python_safe_name: lowercase alphanumerics, underscore for
+# everything else. The input is ASCII after toascii() so 128 entries cover
+# every character and the whole pipeline runs in one C-level pass.
+_SAFE_NAME_TABLE = {
+    c: ord(chr(c).lower()) if chr(c).isalnum() else 0x5F
+    for c in range(128)
+}
+
+
 def python_safe_name(s):
     """
     Return a name derived from string `s` safe to use as a Python identifier.
     """
-    if not isinstance(s, str):
-        s = as_unicode(s)
+    # toascii() performs the bytes-to-str conversion itself: checking
+    # here as well would run the same isinstance test twice per call
     s = toascii(s)
-    s = foldcase(s)
-    s = nopunctuation(s)
-    s = s.replace(' ', '_')
-    s = '_'.join(s.split())
-    s = s.strip('_')
-    return s
+    return s.translate(_SAFE_NAME_TABLE).strip('_')
+
+
+# encoding picked by the last UnicodeDammit detection in as_unicode
+_detected_encoding = None
 
 
 def as_unicode(s):
@@ -143,4 +185,25 @@ def as_unicode(s):
     if not s:
         return s
     assert isinstance(s, bytes), 's must be bytes but is: {}'.format(s)
-    return UnicodeDammit(s).markup
+    # try-then-fallback: most inputs are ASCII or UTF-8 and a plain decode
+    # is a single C pass, while UnicodeDammit runs a full charset
+    # detection scan over the whole byte string
+    try:
+        return s.decode('utf-8')
+    except UnicodeDecodeError:
+        pass
+    global _detected_encoding
+    if _detected_encoding:
+        # bulk calls typically process text sharing one legacy encoding:
+        # retry the last detected codec before a fresh detection scan
+        try:
+            return s.decode(_detected_encoding)
+        except (UnicodeDecodeError, LookupError):
+            pass
+    dammit = UnicodeDammit(s)
+    unicoded = dammit.unicode_markup
+    if unicoded is not None:
+        _detected_encoding = dammit.original_encoding
+        return unicoded
+    # undetectable encoding: latin-1 maps every byte to a code point
+    return s.decode('latin-1')
@@ -0,0 +1,159 @@
+#
+# Copyright (c) nexB Inc. and others. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+# See http://www.apache.org/licenses/LICENSE-2.0 for the license text.
+# See https://github.com/nexB/commoncode for support or download.
+# See https://aboutcode.org for more information about nexB OSS projects.
+#
+
+import os
+import tarfile
+import zipfile
+
+from commoncode import archive
+
+
+def build_tar(location, entries, compression=''):
+    """
+    Create a tar archive at `location` from an `entries` mapping of
+    {archive name: byte content} and return its location.
+    """
+    mode = 'w:' + compression if compression else 'w'
+    with tarfile.open(location, mode) as tar:
+        for name, content in entries.items():
+            path = os.path.join(os.path.dirname(location), 'tar-src-' + os.path.basename(name))
+            with open(path, 'wb') as f:
+                f.write(content)
+            tar.add(path, arcname=name)
+    return location
+
+
+def build_zip(location, entries):
+    """
+    Create a zip archive at `location` from an `entries` sequence of
+    (archive name, text content) pairs and return its location. Pairs may
+    repeat a name to create duplicate entries.
+    """
+    with zipfile.ZipFile(location, 'w') as zipf:
+        for name, content in entries:
+            zipf.writestr(name, content)
+    return location
+
+
+def walk_files(base_dir):
+    """
+    Return a mapping of {posix relative path: byte content} for all files
+    in the `base_dir` tree.
+    """
+    results = {}
+    for top, _dirs, files in os.walk(base_dir):
+        for name in files:
+            location = os.path.join(top, name)
+            relative = os.path.relpath(location, base_dir).replace(os.sep, '/')
+            with open(location, 'rb') as f:
+                results[relative] = f.read()
+    return results
+
+
+def test_extract_tar_extracts_plain_tar(tmp_path):
+    entries = {'a/b.txt': b'hello', 'a/c/d.txt': b'world'}
+    test_tar = build_tar(str(tmp_path / 'test.tar'), entries)
+    target_dir = str(tmp_path / 'out')
+    archive.extract_tar(test_tar, target_dir)
+    assert walk_files(target_dir) == entries
+
+
+def test_extract_tar_extracts_compressed_tar(tmp_path):
+    entries = {'x/y.txt': b'compressed content'}
+    test_tar = build_tar(str(tmp_path / 'test.tar.gz'), entries, compression='gz')
+    target_dir = str(tmp_path / 'out')
+    archive.extract_tar(test_tar, target_dir)
+    assert walk_files(target_dir) == entries
+
+
+def test_extract_tar_warm_cache_extracts_same_results(tmp_path):
+    entries = {'a/b.txt': b'hello', 'a/c/d.txt': b'world'}
+    test_tar = build_tar(str(tmp_path / 'test.tar'), entries)
+    target_dir1 = str(tmp_path / 'out1')
+    target_dir2 = str(tmp_path / 'out2')
+    # the second extraction reuses the cached member list
+    archive.extract_tar(test_tar, target_dir1)
+    archive.extract_tar(test_tar, target_dir2)
+    assert walk_files(target_dir1) == entries
+    assert walk_files(target_dir2) == entries
+
+
+def test_extract_tar_member_cache_is_invalidated_on_file_change(tmp_path):
+    test_tar = str(tmp_path / 'test.tar')
+    build_tar(test_tar, {'a/old.txt': b'old'})
+    archive.extract_tar(test_tar, str(tmp_path / 'out1'))
+
+    build_tar(test_tar, {'a/new.txt': b'new'})
+    # force a different mtime even on filesystems with coarse timestamps
+    st = os.stat(test_tar)
+    os.utime(test_tar, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    target_dir = str(tmp_path / 'out2')
+    archive.extract_tar(test_tar, target_dir)
+    assert walk_files(target_dir) == {'a/new.txt': b'new'}
+
+
+def test_extract_zip_extracts_files(tmp_path):
+    entries = [('a/b.txt', 'hello'), ('a/c/d.txt', 'world')]
+    test_zip = build_zip(str(tmp_path / 'test.zip'), entries)
+    target_dir = str(tmp_path / 'out')
+    archive.extract_zip(test_zip, target_dir)
+    assert walk_files(target_dir) == {'a/b.txt': b'hello', 'a/c/d.txt': b'world'}
+
+
+def test_extract_zip_extracts_many_members_in_parallel(tmp_path):
+    count = archive.ZIP_PARALLEL_THRESHOLD * 4
+    entries = [('many/f%d.txt' % i, 'value %d' % i) for i in range(count)]
+    test_zip = build_zip(str(tmp_path / 'test.zip'), entries)
+    target_dir = str(tmp_path / 'out')
+    archive.extract_zip(test_zip, target_dir)
+    expected = {'many/f%d.txt' % i: b'value %d' % i for i in range(count)}
+    assert walk_files(target_dir) == expected
+
+
+def test_extract_zip_duplicate_entries_first_wins(tmp_path):
+    # enough members to trigger the parallel path alongside the duplicates
+    entries = [('dup/x.txt', 'first'), ('dup/x.txt', 'second')]
+    entries += [('many/f%d.txt' % i, 'v') for i in range(archive.ZIP_PARALLEL_THRESHOLD * 2)]
+    test_zip = build_zip(str(tmp_path / 'test.zip'), entries)
+    target_dir = str(tmp_path / 'out')
+    archive.extract_zip(test_zip, target_dir)
+    with open(os.path.join(target_dir, 'dup', 'x.txt')) as f:
+        assert f.read() == 'first'
+
+
+def test_extract_zip_member_cache_is_invalidated_on_file_change(tmp_path):
+    test_zip = str(tmp_path / 'test.zip')
+    build_zip(test_zip, [('a/old.txt', 'old')])
+    archive.extract_zip(test_zip, str(tmp_path / 'out1'))
+
+    build_zip(test_zip, [('a/new.txt', 'new')])
+    st = os.stat(test_zip)
+    os.utime(test_zip, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    target_dir = str(tmp_path / 'out2')
+    archive.extract_zip(test_zip, target_dir)
+    assert walk_files(target_dir) == {'a/new.txt': b'new'}
+
+
+def test_extract_zip_raw_extracts_files(tmp_path):
+    entries = [('a/b.txt', 'hello')]
+    test_zip = build_zip(str(tmp_path / 'test.zip'), entries)
+    target_dir = str(tmp_path / 'out')
+    archive.extract_zip_raw(test_zip, target_dir)
+    assert walk_files(target_dir) == {'a/b.txt': b'hello'}
+
+
+def test_check_zip_rejects_non_zip(tmp_path):
+    not_zip = tmp_path / 'not.zip'
+    not_zip.write_bytes(b'not a zip at all')
+    try:
+        archive.extract_zip(str(not_zip), str(tmp_path / 'out'))
+        raise AssertionError('Exception not raised')
+    except Exception as e:
+        assert 'Incorrect zip' in str(e)
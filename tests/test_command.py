@@ -47,6 +47,16 @@ class TestCommand(FileBasedTesting):
         # do not throw exception
         stdout.encode('ascii')
 
+    def test_execute_with_decode_none_returns_raw_bytes(self):
+        python = sys.executable
+        rc, stdout, stderr = command.execute(
+            python, ['-c', 'print("foobar")'], decode=None
+        )
+        assert stderr == b''
+        # raw output: no ASCII normalization and no stripping
+        assert stdout.strip() == b'foobar'
+        assert rc == 0
+
     def test_execute2(self):
         python = sys.executable
         rc, stdout, stderr = command.execute2(
@@ -533,6 +533,97 @@ class TestFileUtilsIter(FileBasedTesting):
         ]
         assert sorted(result) == sorted(expected)
 
+    def test_file_iter(self):
+        test_dir = self.get_test_loc('fileutils/walk')
+        base = self.get_test_loc('fileutils')
+        result = [as_posixpath(f.replace(base, '')) for f in fileutils.file_iter(test_dir)]
+        expected = [
+            '/walk/f',
+            '/walk/unicode.zip',
+            '/walk/d1/f1',
+            '/walk/d1/d2/f2',
+            '/walk/d1/d2/d3/f3'
+        ]
+        assert sorted(result) == sorted(expected)
+
+    def test_file_iter_can_iterate_a_single_file(self):
+        test_file = self.get_test_loc('fileutils/walk/f')
+        result = [as_posixpath(f) for f in fileutils.file_iter(test_file)]
+        expected = [as_posixpath(test_file)]
+        assert result == expected
+
+    def test_file_iter_can_walk_an_empty_dir(self):
+        test_dir = self.get_temp_dir()
+        result = list(fileutils.file_iter(test_dir))
+        assert result == []
+
+    def test_file_iter_with_ignore_names(self):
+        test_dir = self.get_test_loc('fileutils/walk')
+        base = self.get_test_loc('fileutils')
+        ignored = fileutils.ignore_names(['d2', 'unicode.zip'])
+        result = [as_posixpath(f.replace(base, '')) for f in fileutils.file_iter(test_dir, ignored=ignored)]
+        expected = [
+            '/walk/f',
+            '/walk/d1/f1'
+        ]
+        assert sorted(result) == sorted(expected)
+
+    def test_file_iter_with_ignore_globs(self):
+        test_dir = self.get_test_loc('fileutils/walk')
+        base = self.get_test_loc('fileutils')
+        ignored = fileutils.ignore_globs('*.zip', 'f?')
+        result = [as_posixpath(f.replace(base, '')) for f in fileutils.file_iter(test_dir, ignored=ignored)]
+        expected = [
+            '/walk/f'
+        ]
+        assert sorted(result) == sorted(expected)
+
+    def test_ignore_globs_ignores_whole_directories(self):
+        test_dir = self.get_test_loc('fileutils/walk')
+        base = self.get_test_loc('fileutils')
+        ignored = fileutils.ignore_globs('d*')
+        result = [as_posixpath(f.replace(base, '')) for f in fileutils.file_iter(test_dir, ignored=ignored)]
+        expected = [
+            '/walk/f',
+            '/walk/unicode.zip'
+        ]
+        assert sorted(result) == sorted(expected)
+
+
+class TestFileUtilsRead(FileBasedTesting):
+    test_data_dir = os.path.join(os.path.dirname(__file__), 'data')
+
+    def test_file_chunks_reads_whole_content_in_fixed_size_chunks(self):
+        test_file = self.get_temp_file()
+        content = b'0123456789' * 100
+        with open(test_file, 'wb') as f:
+            f.write(content)
+        with open(test_file, 'rb') as f:
+            chunks = list(fileutils.file_chunks(f, chunk_size=256))
+        assert all(len(c) <= 256 for c in chunks)
+        assert b''.join(chunks) == content
+
+    def test_read_text_file_returns_text_and_normalizes_line_endings(self):
+        test_file = self.get_temp_file()
+        with open(test_file, 'wb') as f:
+            f.write(b'line1\r\nline2\nline3')
+        result = fileutils.read_text_file(test_file)
+        assert result == 'line1\nline2\nline3'
+
+    def test_read_text_file_can_preserve_line_endings(self):
+        test_file = self.get_temp_file()
+        with open(test_file, 'wb') as f:
+            f.write(b'line1\r\nline2\n')
+        result = fileutils.read_text_file(test_file, universal_new_lines=False)
+        assert result == 'line1\r\nline2\n'
+
+    def test_read_text_file_falls_back_on_non_utf8_content(self):
+        test_file = self.get_temp_file()
+        with open(test_file, 'wb') as f:
+            f.write('héllo\n'.encode('latin-1'))
+        result = fileutils.read_text_file(test_file)
+        assert result == 'héllo\n'
+
 
 class TestBaseName(FileBasedTesting):
     test_data_dir = os.path.join(os.path.dirname(__file__), 'data')